@@ -0,0 +1,14 @@
+CMAKE_MINIMUM_REQUIRED(VERSION 3.3)
+SET(CMAKE_SYSTEM_NAME Linux)
+SET(CMAKE_SYSTEM_PROCESSOR alpha)
+
+SET(CMAKE_FIND_ROOT_PATH "/usr/alpha-linux-gnu/")
+SET(CMAKE_FIND_ROOT_PATH_MODE_PROGRAM NEVER)
+SET(CMAKE_FIND_ROOT_PATH_MODE_LIBRARY ONLY)
+SET(CMAKE_FIND_ROOT_PATH_MODE_INCLUDE ONLY)
+SET(CROSSCOMPILING_EMULATOR "run")
+
+IF(DEFINED CROSS_CHAINLOAD_TOOLCHAIN_FILE AND NOT DEFINED _CROSS_CHAINLOAD_TOOLCHAIN_FILE)
+    INCLUDE("${CROSS_CHAINLOAD_TOOLCHAIN_FILE}")
+    SET(_CROSS_CHAINLOAD_TOOLCHAIN_FILE ON)
+ENDIF()
@@ -0,0 +1,18 @@
+CMAKE_MINIMUM_REQUIRED(VERSION 3.3)
+SET(CMAKE_SYSTEM_NAME Generic)
+CMAKE_POLICY(SET CMP0077 NEW)
+OPTION(JS_ONLY "Compiles to native JS (No WASM)" OFF)
+
+IF(JS_ONLY)
+    ADD_LINK_OPTIONS(-s WASM=0)
+ELSE()
+    ADD_LINK_OPTIONS(-s WASM=1)
+ENDIF()
+
+SET(CROSSCOMPILING_EMULATOR "run")
+INCLUDE(/emsdk/upstream/emscripten/cmake/Modules/Platform/Emscripten.cmake)
+
+IF(DEFINED CROSS_CHAINLOAD_TOOLCHAIN_FILE AND NOT DEFINED _CROSS_CHAINLOAD_TOOLCHAIN_FILE)
+    INCLUDE("${CROSS_CHAINLOAD_TOOLCHAIN_FILE}")
+    SET(_CROSS_CHAINLOAD_TOOLCHAIN_FILE ON)
+ENDIF()
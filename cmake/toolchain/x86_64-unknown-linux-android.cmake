@@ -0,0 +1,19 @@
+# A minimum wrapper that then called the supported android
+# toolchain from the Android NDK.
+CMAKE_MINIMUM_REQUIRED(VERSION 3.3)
+SET(ANDROID_TOOLCHAIN clang)
+SET(ANDROID_ABI x86_64)
+IF(NOT ANDROID_PLATFORM)
+    SET(ANDROID_PLATFORM 30)
+ENDIF()
+
+# Only include the toolchain files once.
+IF(NOT DEFINED _CROSS_ANDROID_TOOLCHAIN_FILE)
+    INCLUDE("/usr/local/ndk/build/cmake/android.toolchain.cmake")
+    SET(_CROSS_ANDROID_TOOLCHAIN_FILE ON)
+ENDIF()
+
+IF(DEFINED CROSS_CHAINLOAD_TOOLCHAIN_FILE AND NOT DEFINED _CROSS_CHAINLOAD_TOOLCHAIN_FILE)
+    INCLUDE("${CROSS_CHAINLOAD_TOOLCHAIN_FILE}")
+    SET(_CROSS_CHAINLOAD_TOOLCHAIN_FILE ON)
+ENDIF()
@@ -0,0 +1,100 @@
+#!/bin/bash
+#
+# Pre-built android NDK.
+
+set -ex
+
+# Check required environment variables.
+if [ "$ARCH" = "" ]; then
+    echo "Invalid arch, must provide a valid architecture prefix."
+    exit 1
+fi
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    wget \
+    unzip
+
+# Use the archive from the local source mirror if it was
+# mounted, otherwise, download it.
+fetch() {
+    if [ -f /sources/"$2" ]; then
+        cp /sources/"$2" "$2"
+    else
+        wget "$1" -O "$2"
+    fi
+}
+
+# Create a source directory for easy cleanup.
+mkdir -p src && cd src
+
+# Extract pre-built Android SDK.
+version=r22b
+fetch https://dl.google.com/android/repository/android-ndk-"$version"-linux-x86_64.zip \
+    android-ndk-"$version"-linux-x86_64.zip
+unzip android-ndk-"$version"-linux-x86_64.zip
+rm android-ndk-"$version"-linux-x86_64.zip
+mkdir -p "/usr/local/ndk/build/cmake"
+mkdir -p "/usr/local/ndk/toolchains"
+cp -r android-ndk-"$version"/source.properties "/usr/local/ndk"
+cp -r android-ndk-"$version"/build/cmake "/usr/local/ndk/build"
+cp -r android-ndk-"$version"/toolchains/llvm "/usr/local/ndk/toolchains"
+
+# Need to remove other installed targets. The sysroot and binutils
+# directories use the prefix for the triple, for example,
+# `arm-linux-androideabi` rather than `armv7a-linux-androideabi`,
+# and the x86 runtime libraries use `i386`, not `i686`.
+dir="/usr/local/ndk/toolchains/llvm/prebuilt/linux-x86_64"
+toolchains=(
+    "aarch64-linux-android"
+    "armv7a-linux-androideabi"
+    "i686-linux-android"
+    "x86_64-linux-android"
+)
+prefixes=(
+    "aarch64"
+    "arm"
+    "i686"
+    "x86_64"
+)
+rm -rf "$dir"/test
+index=0
+while [ $index -lt ${#toolchains[*]} ]; do
+    toolchain="${toolchains[$index]}"
+    prefix="${prefixes[$index]}"
+    triple="$prefix-${toolchain#*-}"
+    if [ "$toolchain" != "$ARCH" ]; then
+        rm -rf "$dir"/"$triple"
+        rm -f "$dir"/bin/"$toolchain"*
+        rm -f "$dir"/bin/"$triple"*
+        rm -f "$dir"/share/man/man1/"$triple"*
+        rm -rf "$dir"/lib/gcc/"$triple"
+        rm -rf "$dir"/sysroot/usr/include/"$triple"
+        rm -rf "$dir"/sysroot/usr/lib/"$triple"
+        rm -rf "$dir"/lib64/clang/11.0.5/lib/linux/"${prefix/i686/i386}"
+        rm -f "$dir"/lib64/clang/11.0.5/lib/linux/*-"$prefix"-android.*
+    else
+        target_triple="$triple"
+    fi
+    index=$(($index + 1));
+done
+
+# Only keep the libraries and compiler wrappers for supported API levels.
+for path in "$dir"/sysroot/usr/lib/"$target_triple"/*/; do
+    api=$(basename "$path")
+    if [[ $api =~ ^[0-9]+$ ]] && { [ $api -lt 21 ] || [ $api -gt 30 ]; }; then
+        rm -rf "$path"
+        rm -f "$dir"/bin/"$ARCH""$api"-clang "$dir"/bin/"$ARCH""$api"-clang++
+    fi
+done
+
+# Cleanup
+cd /
+rm -rf /src
+apt_purge_build
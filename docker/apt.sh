@@ -0,0 +1,114 @@
+#!/bin/bash
+# Shared helpers to install and remove packages with APT.
+#
+# Build scripts source this file, while Dockerfiles can run a
+# function directly, for example, `apt.sh apt_install jq`.
+#
+# Builds mount a shared cache at `/var/cache/apt` and
+# `/var/lib/apt/lists`, so the package lists are only refreshed
+# if the package sources changed or the lists are older than
+# `APT_MAX_AGE` seconds. Concurrent builds share the cache, so
+# all APT commands hold a lock in the cache. The lock is held from
+# checking the lists until the install finishes, so another build
+# with different sources can't refresh the lists in between.
+
+export DEBIAN_FRONTEND="noninteractive"
+APT_MAX_AGE="${APT_MAX_AGE:-86400}"
+apt_lock=/var/lib/apt/lists/.xcross-lock
+apt_stamp=/var/lib/apt/lists/.xcross-sources
+apt_build_packages=()
+
+# Run a command, holding the lock for the shared cache.
+# Commands run with the lock held can call this again.
+apt_locked() {
+    if [ -n "$apt_lock_held" ]; then
+        "$@"
+        return
+    fi
+    (
+        flock 9
+        apt_lock_held=1
+        "$@"
+    ) 9>"$apt_lock"
+}
+
+# Refresh the package lists, if the sources changed or they are stale.
+# Pass `--force` to always refresh the lists.
+apt_update() {
+    apt_locked apt_update_lists "$@"
+}
+
+apt_update_lists() {
+    local sources
+    sources=$(cat /etc/apt/sources.list /etc/apt/sources.list.d/*.list 2>/dev/null | md5sum)
+    if [ "$1" != "--force" ] && [ -f "$apt_stamp" ] && [ "$(cat "$apt_stamp")" = "$sources" ]; then
+        local age=$(($(date +%s) - $(stat -c %Y "$apt_stamp")))
+        if [ "$age" -lt "$APT_MAX_AGE" ]; then
+            return 0
+        fi
+    fi
+    apt-get update
+    echo "$sources" > "$apt_stamp"
+}
+
+# List all installed packages.
+apt_installed() {
+    dpkg-query -W -f '${db:Status-Abbrev} ${binary:Package}\n' | sed -n 's/^ii *//p'
+}
+
+# Install packages, which are kept in the image.
+apt_install() {
+    apt_locked apt_install_packages "$@"
+    # Don't keep the downloaded packages in the image without a cache.
+    if ! mountpoint -q /var/cache/apt; then
+        apt-get clean
+    fi
+}
+
+apt_install_packages() {
+    apt_update_lists
+    if ! apt-get install --assume-yes --no-install-recommends "$@"; then
+        # The cached lists may reference packages removed from the mirror.
+        apt_update_lists --force
+        apt-get install --assume-yes --no-install-recommends "$@"
+    fi
+}
+
+# Install packages only required for the build. We store the newly
+# installed packages, so `apt_purge_build` removes everything that was
+# only required for the build without removing any necessary packages.
+apt_install_build() {
+    local -A before
+    local package
+    while read -r package; do
+        before["$package"]=1
+    done < <(apt_installed)
+    apt_install "$@"
+    while read -r package; do
+        [ -n "${before[$package]}" ] || apt_build_packages+=("$package")
+    done < <(apt_installed)
+}
+
+# Remove all packages only required for the build.
+apt_purge_build() {
+    if [ "${#apt_build_packages[@]}" -ne 0 ]; then
+        apt-get remove --purge --assume-yes "${apt_build_packages[@]}"
+    fi
+    apt-get autoremove --assume-yes
+}
+
+# Pin the package sources to a snapshot of the Ubuntu archive,
+# for example, `20210710T000000Z`. Does nothing without a snapshot.
+apt_snapshot() {
+    if [ -n "$1" ]; then
+        sed -i -E \
+            "s#https?://(archive|security)\.ubuntu\.com/ubuntu/?#http://snapshot.ubuntu.com/ubuntu/$1/#g" \
+            /etc/apt/sources.list
+    fi
+}
+
+# Run a function directly, if the file wasn't sourced.
+if [ "${BASH_SOURCE[0]}" = "$0" ]; then
+    set -ex
+    "$@"
+fi
@@ -0,0 +1,75 @@
+#!/bin/bash
+#
+# Build a custom toolchain using buildroot.
+# These are for libraries that need 32-bit tools installed,
+# such as NDS32.
+
+set -ex
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+# This is probably more than we need, but
+# since we remove them later, it's no big deal.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    autoconf \
+    bc \
+    bison \
+    cpio \
+    flex \
+    g++ \
+    gawk \
+    libc6-i386 \
+    lib32stdc++6 \
+    help2man \
+    libncurses-dev \
+    libtool-bin \
+    patch \
+    python3 \
+    python3-dev \
+    python3-pip \
+    rsync \
+    texinfo \
+    unzip \
+    wget \
+    xz-utils \
+    lib32z1
+
+# Use the archive from the local source mirror if it was
+# mounted, otherwise, download it.
+fetch() {
+    if [ -f /sources/"$2" ]; then
+        cp /sources/"$2" "$2"
+    else
+        wget "$1" -O "$2"
+    fi
+}
+
+# Create a source directory for easy cleanup.
+mkdir -p src && cd src
+
+# Download, extract, and build buildroot.
+fetch https://buildroot.org/downloads/buildroot-2021.02.3.tar.gz \
+    buildroot-2021.02.3.tar.gz
+tar xvf buildroot-2021.02.3.tar.gz
+rm -f buildroot-2021.02.3.tar.gz
+cd buildroot-2021.02.3
+
+# Copy our configurations over.
+cp /src/.config ./
+make sdk -j 5
+
+# Now need to copy over the toolchain to our install prefix.
+mv output/host /home/cross/buildroot
+/home/cross/buildroot/relocate-sdk.sh
+
+# Cleanup
+# Even though we didn't install GCC, it doesn't get autoremoved,
+# which takes up a lot of space.
+cd /
+rm -rf /src
+apt_purge_build
@@ -0,0 +1,33 @@
+#!/bin/bash
+#
+# Upgrade CMake to the latest version.
+
+set -ex
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    apt-transport-https \
+    ca-certificates \
+    gnupg \
+    software-properties-common \
+    wget
+
+# Add the signing key
+wget -qO - https://apt.kitware.com/keys/kitware-archive-latest.asc | apt-key add -
+
+# Add the repository. The package lists are refreshed
+# on the next install, since the sources changed.
+apt-add-repository 'deb https://apt.kitware.com/ubuntu/ focal main'
+
+# Upgrade CMake
+apt_install \
+    cmake
+
+# Cleanup
+apt_purge_build
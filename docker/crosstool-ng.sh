@@ -0,0 +1,54 @@
+#!/bin/bash
+#
+# Build crosstool-NG, which is shared by all crosstool-NG images.
+
+set -ex
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    autoconf \
+    bison \
+    flex \
+    g++ \
+    gawk \
+    help2man \
+    libncurses-dev \
+    libtool-bin \
+    patch \
+    texinfo \
+    wget \
+    xz-utils
+
+# Use the archive from the local source mirror if it was
+# mounted, otherwise, download it.
+fetch() {
+    if [ -f /sources/"$2" ]; then
+        cp /sources/"$2" "$2"
+    else
+        wget "$1" -O "$2"
+    fi
+}
+
+# Create a source directory for easy cleanup.
+mkdir -p src && cd src
+
+# Build ct-ng
+ctng_version="1.24.0"
+fetch http://crosstool-ng.org/download/crosstool-ng/crosstool-ng-"$ctng_version".tar.xz \
+    crosstool-ng-"$ctng_version".tar.xz
+tar xvf crosstool-ng-"$ctng_version".tar.xz
+cd crosstool-ng-"$ctng_version"
+./configure --prefix=/usr/local/crosstool-ng
+make -j 5
+make install
+
+# Cleanup
+cd /
+rm -rf /src
+apt_purge_build
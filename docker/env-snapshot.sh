@@ -0,0 +1,26 @@
+#!/bin/bash
+# Snapshot the fully-resolved shell environment.
+#
+# Evaluating `/etc/profile` and `/etc/bash.bashrc` can be expensive,
+# for example, `emsdk_env.sh` spawns Python on every shell start.
+# Resolve the environment once at build time, so commands can
+# source a single file with only variable assignments.
+
+snapshot=/env/snapshot
+
+# Simulate an interactive login shell, so `/etc/bash.bashrc`,
+# including any commands appended to it, is also evaluated.
+# Don't exit on errors here, since the profile scripts aren't
+# written to be run with `set -e`.
+PS1='$ '
+source /etc/profile
+unset PS1
+
+set -e
+
+# Remove any session-specific variables, which would otherwise
+# clobber the values of the user running the container.
+export -p \
+    | grep -Ev '^declare -x (HOME|HOSTNAME|LOGNAME|OLDPWD|PWD|SHLVL|TERM|USER|_)(=|$)' \
+    > "$snapshot"
+chmod 644 "$snapshot"
@@ -0,0 +1,125 @@
+#!/bin/bash
+#
+# Build a cross-installation of GCC with custom patches.
+
+set -ex
+
+# Check required environment variables.
+if [ "$ARCH" = "" ]; then
+    echo 'Must set the host architecture via `$ARCH`, quitting.'
+    exit 1
+fi
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+# python3 is for glibc
+# python3-pip and python3-dev for gdb
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    autoconf \
+    bison \
+    flex \
+    g++ \
+    gawk \
+    help2man \
+    libncurses-dev \
+    libtool-bin \
+    patch \
+    python3 \
+    python3-dev \
+    python3-pip \
+    texinfo \
+    unzip \
+    wget \
+    xz-utils
+
+# Create a source directory for easy cleanup.
+# crosstool-NG itself is copied from the shared builder image.
+mkdir -p /src
+
+# Toolchains can be built using:
+#   ct-ng menuconfig
+#
+# Make sure to set under "Target options":
+#   Target Architecture
+#   ABI
+#   Bitness
+#   Endianness
+#
+# Make sure to set under "Toolchain Options":
+#   Build Static Toolchain
+#
+# Make sure to set under "Operating System":
+#   Target OS
+#
+# Make sure to set under "C compiler":
+#   C++
+#
+# The config then needs to be patched to set:
+#   CT_GCC_V_10=y
+#   # CT_GCC_V_9 is not set
+#   CT_GCC_VERSION="10.2.0"
+#
+# If using GLIBC, then we need to patch the config to set:
+#   CT_GLIBC_V_2_31=y
+#   # CT_GLIBC_V_2_30 is not set
+#   # CT_GLIBC_V_2_29 is not set
+#   CT_GLIBC_VERSION="2.31"
+
+# Copy config files over and build our toolchain.
+# When debugging, use `CT_DEBUG_CT_SAVE_STEPS=1 ct-ng build`
+# so the build can restart. Find the offending step via
+# `ct-ng list-steps`, and then restart via
+# `RESTART=$step ct-ng build`. This dramatically speeds up
+# debugging new builds.
+cd /src
+mkdir ct-ng-build
+chown -R cross:cross ct-ng-build
+cd ct-ng-build
+cp /ct-ng/"$ARCH".config .config
+chown cross:cross .config
+
+# Build up until we have the dependencies for the host.
+# We do the build in 2 steps: first stop after an initial step,
+# then restart the build after patching the libraries.
+# The download can sometimes stall indefinitely, so use a timeout
+# to ensure the command runs fully.
+step=companion_tools_for_build
+download() {
+    # timeout is a command, not a built-in, so it won't
+    # work with any bash functions: must call a command.
+    timeout 5m \
+        su cross -c \
+        "STOP=$step CT_DEBUG_CT_SAVE_STEPS=1 /usr/local/crosstool-ng/bin/ct-ng build.5"
+}
+
+cd /src/ct-ng-build
+su cross -c "mkdir -p /home/cross/src"
+# Seed the local tarballs directory from the source mirror.
+for file in /sources/*.tar.*; do
+    [ -f "$file" ] && ln -sf "$file" /home/cross/src/
+done
+while download; [ $? -eq 124 ]; do
+    # Indicates a timeout, repeat the command.
+    sleep 1m
+done
+
+# Apply the diffs.
+for patch in /src/diff/*.sh; do
+    "$patch"
+done
+
+# Re-run the build with the applied patches.
+su cross -c "CT_DEBUG_CT_SAVE_STEPS=1 /usr/local/crosstool-ng/bin/ct-ng build.5"
+
+# Cleanup
+# Even though we didn't install GCC, it doesn't get autoremoved,
+# which takes up a lot of space.
+cd /
+rm -rf /src
+rm -rf /home/cross/src
+apt_purge_build
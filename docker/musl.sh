@@ -0,0 +1,116 @@
+#!/bin/bash
+#
+# Build a cross-installation of GCC with musl libc.
+
+set -ex
+
+# Check required environment variables.
+if [ "$ARCH" = "" ]; then
+    echo "Invalid arch, must provide a valid architecture prefix."
+    exit 1
+fi
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+# This is probably more than we need, but
+# since we remove them later, it's no big deal.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    autoconf \
+    bison \
+    flex \
+    g++ \
+    gawk \
+    help2man \
+    libncurses-dev \
+    libtool-bin \
+    patch \
+    python3 \
+    python3-dev \
+    python3-pip \
+    texinfo \
+    unzip \
+    wget \
+    xz-utils
+
+# Use the archive from the local source mirror if it was
+# mounted, otherwise, download it.
+fetch() {
+    if [ -f /sources/"$2" ]; then
+        cp /sources/"$2" "$2"
+    else
+        wget "$1" -O "$2"
+    fi
+}
+
+# Create a source directory for easy cleanup.
+mkdir -p src && cd src
+
+# Clone and configure musl cross.
+fetch https://github.com/richfelker/musl-cross-make/archive/refs/tags/v0.9.9.zip \
+    musl-cross-make-0.9.9.zip
+unzip musl-cross-make-0.9.9.zip
+rm musl-cross-make-0.9.9.zip
+cd musl-cross-make-0.9.9
+echo "cd45a512af1c8a508976c1beb4f5825b3bb89f4d  binutils-2.32.tar.xz" > "hashes/binutils-2.32.tar.xz.sha1"
+echo "8de0aecd3a52bb92b43082df8a9256356d1f03be  gcc-10.2.0.tar.xz" > "hashes/gcc-10.2.0.tar.xz.sha1"
+echo "e7ba5f0a5f89c13843b955e916f1d9a9d4b6ab9a  musl-1.2.2.tar.gz" > "hashes/musl-1.2.2.tar.gz.sha1"
+echo "366ded6a44cd108ba6b3f5b9a252eab3f3a95cdf  gmp-6.1.2.tar.bz2" > "hashes/gmp-6.1.2.tar.bz2.sha1"
+echo "b019d9e1d27ec5fb99497159d43a3164995de2d0  mpc-1.1.0.tar.gz" > "hashes/mpc-1.1.0.tar.gz.sha1"
+echo "d6a313a3b1ceb9ff3be71cd18e45468837b7fd53  mpfr-4.0.2.tar.bz2" > "hashes/mpfr-4.0.2.tar.bz2.sha1"
+echo "b1d96b7b44c72f86c98d4fbd4caaa7796b27681e  isl-0.20.tar.bz2" > "hashes/isl-0.20.tar.bz2.sha1"
+echo "2663224361a984c8a62b9cf9fc8c82c0a75f9f3f  linux-4.19.90.tar.xz" > "hashes/linux-4.19.90.tar.xz.sha1"
+echo "de12b9c8ae2de9e85056a36be9f0fcc0a1e4abe9  linux-headers-4.19.88.tar.xz" > "hashes/linux-headers-4.19.88.tar.xz.sha1"
+
+# Seed the sources from the source mirror. These must be copied,
+# so they're newer than the hashes and aren't downloaded again.
+mkdir -p sources
+for hash in hashes/*.sha1; do
+    file=$(basename "$hash" .sha1)
+    [ -f /sources/"$file" ] && cp /sources/"$file" sources/
+done
+
+# Set our configurations.
+su cross -c "mkdir -p /home/cross/musl"
+cp /src/config.mak ./
+make -j 5
+make install
+
+# Need to strip binaries, since the installer doesn't do that
+strip_shared() {
+    strip=strip
+    if [ "$2" != "" ]; then
+        strip="$2"
+    fi
+    mime=$(file "$1" --mime-type | cut -d ' ' -f 2)
+    # Don't strip archives: we need those symbols.
+    if [ "$mime" = "application/x-sharedlib" ] || [ "$mime" = "application/x-executable" ]; then
+        "$strip" "$1"
+    fi
+}
+
+strip_dir() {
+    files=($(ls "$1"))
+    for f in "${files[@]}"; do
+        strip_shared "$1/$f" "$2"
+    done
+}
+
+home=/home/cross/musl
+strip_native="$home/bin/"$ARCH"-strip"
+strip_dir "$home/bin"
+strip_dir "$home/lib"
+strip_dir "$home/"$ARCH"/bin"
+strip_dir "$home/libexec/gcc/"$ARCH"/10.2.0"
+strip_dir "$home/"$ARCH"/lib" "$strip_native"
+
+# Cleanup
+# Even though we didn't install GCC, it doesn't get autoremoved,
+# which takes up a lot of space.
+cd /
+rm -rf /src
+apt_purge_build
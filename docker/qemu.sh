@@ -0,0 +1,126 @@
+#!/bin/bash
+#
+# Build Qemu for custom targets, which is shared by all Qemu images.
+#   Ex: TARGETS=riscv32-linux-user,riscv64-linux-user ./qemu.sh
+
+set -ex
+
+# Check required environment variables.
+if [ "$TARGETS" = "" ]; then
+    echo "Invalid list of targets, must provide at least 1."
+    exit 1
+fi
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    autoconf \
+    automake \
+    autotools-dev \
+    bc \
+    binutils-dev \
+    bison \
+    build-essential \
+    curl \
+    flex \
+    gawk \
+    gperf \
+    libexpat-dev \
+    libglib2.0-dev \
+    libgmp-dev \
+    libmpc-dev \
+    libmpfr-dev \
+    libpcre3-dev \
+    libtool \
+    ninja-build \
+    patchutils \
+    pkg-config \
+    python3 \
+    python3-dev \
+    python3-pip \
+    texinfo \
+    wget \
+    xz-utils \
+    zlib1g-dev
+
+# Use the archive from the local source mirror if it was
+# mounted, otherwise, download it.
+fetch() {
+    if [ -f /sources/"$2" ]; then
+        cp /sources/"$2" "$2"
+    else
+        wget "$1" -O "$2"
+    fi
+}
+
+# Create a source directory for easy cleanup.
+mkdir -p src && cd src
+
+# Extract Qemu
+fetch https://download.qemu.org/qemu-6.0.0.tar.xz qemu-6.0.0.tar.xz
+tar xf qemu-6.0.0.tar.xz
+cd qemu-6.0.0
+
+# Build Qemu
+# The full list of valid targets is:
+#   alpha-linux-user
+#   arm-linux-user
+#   armeb-linux-user
+#   cris-linux-user
+#   hexagon-linux-user
+#   hppa-linux-user
+#   i386-linux-user
+#   m68k-linux-user
+#   microblaze-linux-user
+#   microblazeel-linux-user
+#   mips-linux-user
+#   mips64-linux-user
+#   mips64el-linux-user
+#   mipsel-linux-user
+#   mipsn32-linux-user
+#   mipsn32el-linux-user
+#   nios2-linux-user
+#   or1k-linux-user
+#   ppc-linux-user
+#   ppc64-linux-user
+#   ppc64le-linux-user
+#   riscv32-linux-user
+#   riscv64-linux-user
+#   s390x-linux-user
+#   sh4-linux-user
+#   sh4eb-linux-user
+#   sparc-linux-user
+#   sparc32plus-linux-user
+#   sparc64-linux-user
+#   x86_64-linux-user
+#   xtensa-linux-user
+#   xtensaeb-linux-user
+mkdir build && cd build
+../configure \
+        --prefix=/usr/local/qemu \
+        --static \
+        --target-list="$TARGETS" \
+        --disable-docs \
+        --disable-system \
+        --disable-tools \
+        --python=python3
+make -j 5
+make install
+
+# Use the same names as the qemu-user-static package, and strip
+# the binaries, since they're copied into every Qemu image.
+for target in ${TARGETS//,/ }; do
+    bin=/usr/local/qemu/bin/qemu-"${target%-linux-user}"
+    strip "$bin"
+    mv "$bin" "$bin"-static
+done
+
+# Remove all dependencies, to ensure we have a small image.
+cd /
+rm -rf /src
+apt_purge_build
@@ -0,0 +1,56 @@
+#!/bin/bash
+# Slim an installed toolchain before it is copied into the final image.
+#
+# This strips host executables and libraries, removes documentation
+# and translations, and hardlinks identical files. The sizes before
+# and after are written to `/slim.json`, which `setup.py` exports and
+# records as image labels. This runs in the builder stage, so any
+# packages it installs are discarded.
+#
+# Usage: slim.sh <prefix>
+
+set -e
+
+prefix="$1"
+
+if ! command -v strip >/dev/null 2>&1; then
+    source /usr/local/lib/xcross/apt.sh
+    apt_install binutils
+fi
+
+before=$(du -sb "$prefix" | cut -f1)
+
+# Remove documentation, translations and build logs.
+for name in doc info locale man; do
+    find "$prefix" -depth -type d -path "*/share/$name" -exec rm -rf {} +
+done
+find "$prefix" -type f -name "build.log.bz2" -delete
+
+# Strip all host (x86_64) executables and shared libraries. The
+# target sysroots are skipped, since those are used for debugging.
+find "$prefix" -type f \( -perm -u+x -o -name "*.so*" \) -not -path "*/sysroot/*" -print0 \
+    | while IFS= read -r -d '' file; do
+        magic=$(od -An -tx1 -N4 "$file" | tr -d ' ')
+        machine=$(od -An -tx1 -j18 -N2 "$file" | tr -d ' ')
+        if [ "$magic" = "7f454c46" ] && [ "$machine" = "3e00" ]; then
+            strip --strip-unneeded "$file" 2>/dev/null || true
+        fi
+    done
+
+# Hardlink identical files with the same permissions.
+find "$prefix" -type f ! -empty -exec md5sum {} + \
+    | sort \
+    | while read -r digest file; do
+        if [ "$digest" = "$previous" ] \
+            && [ "$(stat -c %a "$file")" = "$(stat -c %a "$first")" ] \
+            && cmp -s "$first" "$file"; then
+            ln -f "$first" "$file"
+        else
+            previous="$digest"
+            first="$file"
+        fi
+    done
+
+after=$(du -sb "$prefix" | cut -f1)
+echo "Slimmed $prefix from $before to $after bytes."
+printf '{"before": %d, "after": %d}\n' "$before" "$after" > /slim.json
@@ -0,0 +1,54 @@
+#!/bin/bash
+#
+# Install vcpkg package management system.
+
+set -ex
+
+# There's a minor, well-known issue with wasm and vcpkg.
+# vcpkg runs in script mode for the CMake files, meaning
+# the `CMAKE_EXECUTABLE_SUFFIX` is not set, so all binaries
+# will not have the `.js` suffix (although the wasm ones will).
+#   https://github.com/microsoft/vcpkg/blob/master/docs/maintainers/maintainer-guide.md#useful-implementation-notes
+
+export DEBIAN_FRONTEND="noninteractive"
+
+# Install dependencies. We store the installed
+# dependencies so we don't accidentally delete
+# necessary files, and we get rid of everything
+# that was only required for the build.
+source /usr/local/lib/xcross/apt.sh
+apt_install_build \
+    curl \
+    g++ \
+    git \
+    ca-certificates \
+    jq \
+    wget \
+    unzip
+
+# Download our latest release.
+url="https://api.github.com/repos/microsoft/vcpkg/releases/latest"
+release=$(curl "$url" --silent | jq -r '.zipball_url')
+wget "$release" -O vcpkg.zip
+mkdir -p "/opt"/vcpkg/
+unzip vcpkg.zip -d "/opt"/vcpkg/
+rm -f vcpkg.zip
+subdir=$(ls "/opt"/vcpkg)
+shopt -s dotglob
+mv "/opt"/vcpkg/"$subdir"/* "/opt"/vcpkg
+shopt -u dotglob
+rmdir "/opt"/vcpkg/"$subdir"
+
+# Bootstrap the build, and remove unnecessary extras.
+"/opt"/vcpkg/bootstrap-vcpkg.sh
+
+# Change our permissions, since we need to be able to write as a user.
+# Use the user ID, not the actual username, since the user hasn't yet
+# been created.
+chmod -R +660 "/opt"/vcpkg
+chown -R 1000:1000 "/opt"/vcpkg
+
+# Cleanup
+# Even though we didn't install GCC, it doesn't get autoremoved,
+# which takes up a lot of space.
+apt_purge_build
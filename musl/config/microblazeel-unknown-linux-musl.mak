@@ -0,0 +1,14 @@
+# Custom configurations to use the same defaults
+# as the global configurations.
+
+TARGET = microblazeel-linux-musl
+OUTPUT = /home/cross/musl
+BINUTILS_VER = 2.32
+GCC_VER = 10.2.0
+MUSL_VER = 1.2.2
+GMP_VER = 6.1.2
+MPC_VER = 1.1.0
+MPFR_VER = 4.0.2
+ISL_VER = 0.20
+LINUX_VER = headers-4.19.88
+GCC_CONFIG += --enable-languages=c,c++
\ No newline at end of file
@@ -21,10 +21,14 @@
 # -------
 
 import ast
+import concurrent.futures
 import enum
+import functools
 import glob
+import hashlib
 import itertools
 import json
+import multiprocessing
 import re
 import os
 import setuptools
@@ -32,7 +36,13 @@ import shutil
 import stat
 import subprocess
 import sys
+import tempfile
 import textwrap
+import threading
+import time
+import urllib.request
+import xml.etree.ElementTree as ElementTree
+import zlib
 
 try:
     from setuptools import setup, Command
@@ -63,8 +73,12 @@ def load_json(path):
     # a complex parser, so we do something very simple:
     # only remove lines starting with '//'.
     with open(path) as file:
-        lines = file.read().splitlines()
-    lines = [i for i in lines if not i.strip().startswith('//')]
+        return parse_json(file.read())
+
+def parse_json(contents):
+    '''Parse JSON data with C++-style comments.'''
+
+    lines = [i for i in contents.splitlines() if not i.strip().startswith('//')]
     return json.loads('\n'.join(lines))
 
 HOME = os.path.dirname(os.path.realpath(__file__))
@@ -158,6 +172,9 @@ riscv_newlib_version = config['riscv-gnu-toolchain']['newlib-version']
 
 # Other config options.
 bin_directory = f'{config["options"]["sysroot"]}/bin/'
+# Install prefixes in the shared builder images.
+crosstool_prefix = '/usr/local/crosstool-ng'
+qemu_prefix = '/usr/local/qemu'
 
 # Read the long description.
 description = 'Zero-setup cross compilation.'
@@ -169,6 +186,10 @@ with open(f'{HOME}/README.md') as file:
 
 # Literal boolean type for command arguments.
 bool_type = (type(None), bool, int)
+# Literal integer type for command arguments.
+int_type = (type(None), int)
+# Literal numeric type for command arguments.
+number_type = (type(None), int, float)
 
 def parse_literal(inst, key, default, valid_types=None):
     '''Parse literal user options.'''
@@ -218,36 +239,29 @@ def image_from_target(target, with_pkg=False):
         repository = f'pkg{repository}'
     return f'{username}/{repository}:{target}'
 
+def target_aliases(target):
+    '''Get the alias targets served by an image.'''
+
+    registry = get_registry()
+    if target not in registry.targets:
+        return []
+    return [i.target for i in registry[target].aliases]
+
 def sorted_image_targets():
     '''Get a sorted list of image targets.'''
-
-    # Need to write the total image list.
-    os_images = []
-    metal_images = []
-    other_images = []
-    for image in images:
-        if image.os.is_os():
-            os_images.append(image.target)
-        elif image.os.is_baremetal():
-            metal_images.append(image.target)
-        else:
-            other_images.append(image.target)
-    os_images.sort()
-    metal_images.sort()
-    other_images.sort()
-    return os_images + metal_images + other_images
+    return get_registry().sorted_targets
 
 def subslice_targets(start=None, stop=None):
     '''Extract a subslice of all targets.'''
+    return get_registry().subslice(start, stop)
 
-    targets = sorted_image_targets()
-    if start is not None:
-        targets = targets[targets.index(start):]
-    if stop is not None:
-        targets = targets[:targets.index(stop) + 1]
-    return targets
+# Shared images other images are built from, which are never tagged.
+shared_images = ('base', 'crosstool-ng', 'qemu', 'vcpkg')
 
-def build_image(docker, target, with_pkg=False):
+# Label prefix for the toolchain sizes before and after slimming.
+slim_label = 'org.xcross.slim'
+
+def build_image(docker, target, with_pkg=False, log=None, compression=None):
     '''Call Docker to build a single target.'''
 
     image = image_from_target(target, with_pkg)
@@ -255,7 +269,575 @@ def build_image(docker, target, with_pkg=False):
     if with_pkg:
         image_dir = f'pkg{image_dir}'
     path = f'{HOME}/docker/{image_dir}/Dockerfile.{target}'
-    return subprocess.call([docker, 'build', '-t', image, HOME, '--file', path])
+    # The source mirror is bind-mounted, so it must exist, even if empty.
+    os.makedirs(sources_directory, exist_ok=True)
+    # Only send the files the image uses as the build context.
+    write_dockerignore(path)
+    # BuildKit is required for cache and bind mounts.
+    env = os.environ.copy()
+    env['DOCKER_BUILDKIT'] = '1'
+    if log is not None:
+        # Concurrent builds write to a log, rather than interleaving output.
+        os.makedirs(os.path.dirname(log), exist_ok=True)
+        open(log, 'w').close()
+
+    def call(command):
+        if log is None:
+            return subprocess.call(command, env=env)
+        with open(log, 'a') as file:
+            command = command[:2] + ['--progress=plain'] + command[2:]
+            return subprocess.call(command, env=env, stdout=file, stderr=subprocess.STDOUT)
+
+    command = [docker, 'build', '-t', image, HOME, '--file', path]
+    labels = slim_labels(docker, path, call)
+    if labels is None:
+        return 1
+    command += labels
+    if compression is not None:
+        # Recompress all layers, including those from the base images.
+        output = f'type=image,name={image},compression={compression},force-compression=true'
+        command += ['--output', output]
+    return call(command)
+
+def slim_labels(docker, path, call):
+    '''
+    Get the labels recording the toolchain size before and after slimming.
+
+    The builder stage writes the sizes to `/slim.json`, which is exported
+    from the `slim-report` stage, so the final image doesn't contain it.
+    This also builds the builder stage, so the image build reuses it.
+    Returns None if the export failed.
+    '''
+
+    with open(path) as file:
+        if ' AS slim-report\n' not in file.read():
+            return []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = f'type=local,dest={tmpdir}'
+        command = [docker, 'build', HOME, '--file', path, '--target', 'slim-report']
+        if call(command + ['--output', output]) != 0:
+            return None
+        with open(f'{tmpdir}/slim.json') as file:
+            slim = json.load(file)
+    labels = []
+    for key in ('before', 'after'):
+        labels += ['--label', f'{slim_label}.{key}={slim[key]}']
+    return labels
+
+def total_memory():
+    '''Get the total physical memory, in GB.'''
+
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024**3
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def docker_root(docker):
+    '''Get the directory Docker stores images in.'''
+
+    try:
+        command = [docker, 'info', '--format', '{{.DockerRootDir}}']
+        output = subprocess.check_output(command, stderr=subprocess.DEVNULL)
+        path = output.decode('utf-8').strip()
+        if os.path.isdir(path):
+            return path
+    except (subprocess.CalledProcessError, OSError):
+        pass
+    return HOME
+
+def free_disk(path):
+    '''Get the free disk space for a path, in GB.'''
+    return shutil.disk_usage(path).free / 1024**3
+
+# Content hashes of the last successful build of each image.
+build_manifest = f'{HOME}/.build-manifest.json'
+# State of each image in the current or last run of `build_images`.
+build_journal = f'{HOME}/.build-journal.json'
+
+def image_id(docker, image):
+    '''Get the ID (config digest) of a local image, or None if it does not exist.'''
+
+    command = [docker, 'image', 'inspect', '--format', '{{.Id}}', image]
+    process = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    if process.returncode != 0:
+        return None
+    return process.stdout.decode('utf-8').strip()
+
+class BuildJournal:
+    '''
+    Durable record of the state of each image build.
+
+    Each image has a state, one of `pending`, `building`, `built`,
+    `tagged` or `failed`, along with the build duration and the
+    resulting image ID. The journal is saved after every update,
+    so it survives the build process being killed.
+    '''
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = entries or {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def load(path):
+        '''Load the journal, or create an empty journal if it does not exist.'''
+
+        try:
+            with open(path) as file:
+                return BuildJournal(path, json.load(file))
+        except FileNotFoundError:
+            return BuildJournal(path)
+
+    def get(self, image):
+        '''Get the journal entry for an image.'''
+
+        with self.lock:
+            return dict(self.entries.get(image, {}))
+
+    def update(self, image, **fields):
+        '''Update the journal entry for an image, and save the journal.'''
+
+        with self.lock:
+            self.entries.setdefault(image, {}).update(fields)
+            self.save()
+
+    def save(self):
+        '''Save the journal atomically, so it is never partially written.'''
+
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+            file.write('\n')
+        os.replace(tmp, self.path)
+
+# Build time and size telemetry for each image build, one JSON record per line.
+image_history = f'{HOME}/.image-history.jsonl'
+image_history_lock = threading.Lock()
+
+def config_versions():
+    '''Get the versions of all dependencies in the config.'''
+
+    versions = {}
+    for key, value in config.items():
+        if isinstance(value, dict) and 'version' in value:
+            version = value['version']
+            parts = [version[i] for i in ('major', 'minor', 'patch') if version.get(i)]
+            versions[key] = '.'.join(parts)
+    return versions
+
+def image_layers(docker, image):
+    '''Get the size and command of each layer in an image, from newest to oldest.'''
+
+    command = [
+        docker, 'history', '--human=false', '--no-trunc',
+        '--format', '{{.Size}}\t{{.CreatedBy}}', image,
+    ]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if process.returncode != 0:
+        return None
+    layers = []
+    for line in process.stdout.decode('utf-8').splitlines():
+        size, _, created_by = line.partition('\t')
+        layers.append({'size': int(size), 'created_by': created_by})
+    return layers
+
+def image_size(docker, image):
+    '''Get the uncompressed size of an image, in bytes.'''
+
+    command = [docker, 'image', 'inspect', '--format', '{{.Size}}', image]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if process.returncode != 0:
+        return None
+    return int(process.stdout.decode('utf-8').strip())
+
+def compressed_image_size(docker, image):
+    '''Estimate the compressed (pull) size of an image, in bytes.'''
+
+    # Registries store layers gzip-compressed, so gzip the
+    # exported image without writing it to disk.
+    size = 0
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    command = [docker, 'save', image]
+    with subprocess.Popen(command, stdout=subprocess.PIPE) as process:
+        for chunk in iter(lambda: process.stdout.read(1 << 20), b''):
+            size += len(compressor.compress(chunk))
+    if process.returncode != 0:
+        return None
+    return size + len(compressor.flush())
+
+def slim_report(docker, image):
+    '''Get the toolchain size before and after slimming, if the image was slimmed.'''
+
+    fmt = '{{json .Config.Labels}}'
+    command = [docker, 'image', 'inspect', '--format', fmt, image]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if process.returncode != 0:
+        return None
+    try:
+        labels = json.loads(process.stdout) or {}
+        return {key: int(labels[f'{slim_label}.{key}']) for key in ('before', 'after')}
+    except (KeyError, ValueError):
+        return None
+
+def record_image_telemetry(docker, image, duration, compressed=False):
+    '''Append the build time and size telemetry of an image to the history.'''
+
+    # Estimating the compressed size exports the entire image,
+    # which is slow for toolchain images, so it's opt-in.
+    compressed_size = None
+    if compressed:
+        compressed_size = compressed_image_size(docker, image)
+    record = {
+        'image': image,
+        'time': time.time(),
+        'duration': duration,
+        'size': image_size(docker, image),
+        'compressed_size': compressed_size,
+        'layers': image_layers(docker, image),
+        'slim': slim_report(docker, image),
+        'versions': config_versions(),
+    }
+    with image_history_lock:
+        with open(image_history, 'a') as file:
+            file.write(json.dumps(record, sort_keys=True) + '\n')
+
+def load_image_history():
+    '''Load all telemetry records, from oldest to newest.'''
+
+    try:
+        with open(image_history) as file:
+            return [json.loads(i) for i in file if i.strip()]
+    except FileNotFoundError:
+        return []
+
+# Toolchain and emulator benchmark results to compare runs against.
+benchmark_baseline = f'{HOME}/.benchmark-baseline.json'
+
+def load_test_durations(paths):
+    '''Load the duration of each test, in seconds, from JSON reports.'''
+
+    # Each shard only reports its own tests, so merge the reports.
+    durations = {}
+    for path in paths:
+        with open(path) as file:
+            data = json.load(file)
+        # Also accept a map of test names to durations.
+        if isinstance(data, list):
+            data = {i['name']: i['duration'] for i in data if i['status'] != 'skipped'}
+        durations.update(data)
+    return durations
+
+def shard_tests(tests, durations, index, count):
+    '''Get the tests for a shard, balancing the shards by test duration.'''
+
+    # Assign the longest tests first, each to the shard with the
+    # shortest total duration. Tests without a recorded duration
+    # use the median duration. This is deterministic, so every
+    # machine computes the same shards from the same durations.
+    known = sorted(durations.values())
+    default = known[len(known) // 2] if known else 1
+
+    def duration(test):
+        return durations.get(test['name'], default)
+
+    totals = [0] * count
+    shards = [[] for _ in range(count)]
+    for test in sorted(tests, key=lambda i: (-duration(i), i['name'])):
+        shard = min(range(count), key=lambda i: (totals[i], i))
+        shards[shard].append(test['name'])
+        if not test['skip']:
+            totals[shard] += duration(test)
+    names = set(shards[index - 1])
+    return [i for i in tests if i['name'] in names], totals[index - 1]
+
+def dockerfile_copies(path):
+    '''Get the build context paths copied by a Dockerfile.'''
+
+    # All copies from the build context use the JSON form,
+    # other copies are from build stages or other images.
+    paths = []
+    with open(path) as file:
+        for line in file:
+            if line.startswith('COPY ['):
+                paths += json.loads(line[len('COPY '):])[:-1]
+    return paths
+
+def dockerfile_mounts(path):
+    '''Get the build context paths bind-mounted by a Dockerfile.'''
+
+    with open(path) as file:
+        contents = file.read()
+    return re.findall(r'--mount=type=bind,\S*?\bsource=([^,\s]+)', contents)
+
+def dockerfile_images(path):
+    '''Get the images a Dockerfile is built from or copies from.'''
+
+    # Stages and external images, like `ubuntu`, aren't our images.
+    prefix = image_from_target('')
+    with open(path) as file:
+        contents = file.read()
+    images = re.findall(r'(?:^FROM\s+|--from=)(\S+)', contents, re.MULTILINE)
+    return [i[len(prefix):] for i in images if i.startswith(prefix)]
+
+def image_dependencies(target):
+    '''Get all the images a target image is built from, in build order.'''
+
+    dependencies = []
+    for image in dockerfile_images(f'{HOME}/docker/images/Dockerfile.{target}'):
+        for dependency in image_dependencies(image) + [image]:
+            if dependency not in dependencies:
+                dependencies.append(dependency)
+    return dependencies
+
+# Changes to these files may affect every image test.
+global_inputs = ('config/config.json', 'setup.py', 'test/')
+
+def changed_files(revision):
+    '''Get the files changed since a git revision, including uncommitted files.'''
+
+    commands = [
+        ['git', 'diff', '--name-only', '--no-renames', revision, '--'],
+        ['git', 'ls-files', '--others', '--exclude-standard'],
+    ]
+    files = set()
+    for command in commands:
+        files.update(subprocess.check_output(command, cwd=HOME).decode('utf-8').splitlines())
+    return sorted(files)
+
+def changed_image_entries(revision):
+    '''Get the targets with image entries changed since a git revision.'''
+
+    path = 'config/images.json'
+    try:
+        command = ['git', 'show', f'{revision}:{path}']
+        contents = subprocess.check_output(command, cwd=HOME, stderr=subprocess.DEVNULL)
+        old = {i['target']: i for i in parse_json(contents.decode('utf-8'))}
+    except subprocess.CalledProcessError:
+        old = {}
+    return {i['target'] for i in load_json(f'{HOME}/{path}') if old.get(i['target']) != i}
+
+def image_inputs(target, manifest):
+    '''Get the repository files an image and its dependencies are built from.'''
+
+    # Generated files depend on the templates they were configured
+    # from, which the configure manifest records.
+    inputs = set()
+    for image in image_dependencies(target) + [target]:
+        dockerfile = f'docker/images/Dockerfile.{image}'
+        for path in [dockerfile] + dockerfile_copies(f'{HOME}/{dockerfile}'):
+            inputs.add(path)
+            inputs.update(i[0] for i in manifest.get(path, {}).get('templates', []))
+    return inputs
+
+def affected_targets(revision, targets):
+    '''Get the targets with images affected by changes since a git revision.'''
+
+    try:
+        with open(configure_manifest) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        raise FileNotFoundError('Unable to find configure manifest, run `setup.py configure`.')
+
+    # Generated files are untracked, and only change with their templates.
+    changed = [i for i in changed_files(revision) if i not in manifest]
+    if any(i.startswith(global_inputs) for i in changed):
+        return set(targets)
+
+    affected = set()
+    if 'config/images.json' in changed:
+        affected |= changed_image_entries(revision)
+    for target in targets:
+        # Tests can use image tags without their own Dockerfile,
+        # so we can't tell what they're built from.
+        if not os.path.exists(f'{HOME}/docker/images/Dockerfile.{target}'):
+            affected.add(target)
+            continue
+        # Copied directories are affected by any changes to their files.
+        inputs = image_inputs(target, manifest)
+        if any(i in inputs or i.startswith(tuple(f'{j}/' for j in inputs)) for i in changed):
+            affected.add(target)
+    return affected & set(targets)
+
+def write_dockerignore(path):
+    '''Write the Dockerfile-specific ignore file, excluding all unused files.'''
+
+    # BuildKit uses `Dockerfile.<target>.dockerignore` rather than
+    # the `.dockerignore` in the build context, if present.
+    paths = set(dockerfile_copies(path)) | set(dockerfile_mounts(path))
+    lines = ['*'] + [f'!{i}' for i in sorted(paths)]
+    write_file(f'{path}.dockerignore', '\n'.join(lines) + '\n', False)
+
+@functools.lru_cache(maxsize=None)
+def path_digest(path):
+    '''Calculate the SHA256 digest of a file or directory in the build context.'''
+
+    hasher = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file in sorted(files):
+                child = os.path.join(root, file)
+                hasher.update(os.path.relpath(child, path).encode('utf-8'))
+                hasher.update(path_digest(child).encode('ascii'))
+    else:
+        with open(path, 'rb') as file:
+            hasher.update(file.read())
+        # The executable bit is preserved by copies.
+        hasher.update(str(os.access(path, os.X_OK)).encode('ascii'))
+    return hasher.hexdigest()
+
+def image_digest(target, with_pkg=False, dependencies=()):
+    '''Calculate the content hash of everything an image is built from.'''
+
+    # The generated files already contain the versions from the
+    # config, so only the image tags need to be hashed separately.
+    # Any changes to an image dependency also change the hash.
+    image_dir = 'pkgimages' if with_pkg else 'images'
+    dockerfile = f'docker/{image_dir}/Dockerfile.{target}'
+    hasher = hashlib.sha256()
+    hasher.update(image_from_target(target, with_pkg).encode('utf-8'))
+    hasher.update(' '.join(semver()).encode('utf-8'))
+    for path in [dockerfile] + sorted(set(dockerfile_copies(f'{HOME}/{dockerfile}'))):
+        hasher.update(path.encode('utf-8'))
+        hasher.update(path_digest(f'{HOME}/{path}').encode('ascii'))
+    for digest in sorted(dependencies):
+        hasher.update(digest.encode('ascii'))
+    return hasher.hexdigest()
+
+# Local mirror of the versioned source archives, which the
+# image builds use instead of downloading the sources.
+sources_directory = f'{HOME}/sources'
+sources_checksums = f'{sources_directory}/SHA256SUMS'
+
+def source_archives():
+    '''Get the filename, URL and optional SHA1 of each versioned source archive.'''
+
+    gnu = 'https://ftpmirror.gnu.org'
+    ndk_version = config['android']['ndk_version']
+
+    def sha1(key, ext):
+        return config[key]['version'].get(f'{ext}_sha1')
+
+    return [
+        (
+            f'android-ndk-{ndk_version}-linux-x86_64.zip',
+            f'https://dl.google.com/android/repository/'
+            f'android-ndk-{ndk_version}-linux-x86_64.zip',
+            None,
+        ),
+        (
+            f'avr-libc-{avr_version}.tar.bz2',
+            f'https://download.savannah.gnu.org/releases/avr-libc/'
+            f'avr-libc-{avr_version}.tar.bz2',
+            None,
+        ),
+        (
+            f'binutils-{binutils_version}.tar.xz',
+            f'{gnu}/binutils/binutils-{binutils_version}.tar.xz',
+            sha1('binutils', 'xz'),
+        ),
+        (
+            f'buildroot-{buildroot_version}.tar.gz',
+            f'https://buildroot.org/downloads/buildroot-{buildroot_version}.tar.gz',
+            None,
+        ),
+        (
+            f'crosstool-ng-{ct_version}.tar.xz',
+            f'http://crosstool-ng.org/download/crosstool-ng/crosstool-ng-{ct_version}.tar.xz',
+            None,
+        ),
+        (
+            f'expat-{expat_version}.tar.xz',
+            f'https://github.com/libexpat/libexpat/releases/download/'
+            f'R_{expat_major}_{expat_minor}_{expat_patch}/expat-{expat_version}.tar.xz',
+            None,
+        ),
+        (
+            f'gcc-{gcc_version}.tar.xz',
+            f'{gnu}/gcc/gcc-{gcc_version}/gcc-{gcc_version}.tar.xz',
+            sha1('gcc', 'xz'),
+        ),
+        (
+            f'glibc-{glibc_version}.tar.xz',
+            f'{gnu}/glibc/glibc-{glibc_version}.tar.xz',
+            None,
+        ),
+        (
+            f'gmp-{gmp_version}.tar.bz2',
+            f'{gnu}/gmp/gmp-{gmp_version}.tar.bz2',
+            sha1('gmp', 'bz2'),
+        ),
+        (
+            f'isl-{isl_version}.tar.bz2',
+            f'https://libisl.sourceforge.io/isl-{isl_version}.tar.bz2',
+            sha1('isl', 'bz2'),
+        ),
+        (
+            f'linux-{linux_version}.tar.xz',
+            f'https://cdn.kernel.org/pub/linux/kernel/v{linux_major}.x/'
+            f'linux-{linux_version}.tar.xz',
+            sha1('linux', 'xz'),
+        ),
+        (
+            f'linux-headers-{linux_headers_version}.tar.xz',
+            f'http://ftp.barfooze.de/pub/sabotage/tarballs/'
+            f'linux-headers-{linux_headers_version}.tar.xz',
+            sha1('linux-headers', 'xz'),
+        ),
+        (
+            f'mingw-w64-v{mingw_version}.tar.bz2',
+            f'https://downloads.sourceforge.net/project/mingw-w64/mingw-w64/'
+            f'mingw-w64-release/mingw-w64-v{mingw_version}.tar.bz2',
+            None,
+        ),
+        (
+            f'mpc-{mpc_version}.tar.gz',
+            f'{gnu}/mpc/mpc-{mpc_version}.tar.gz',
+            sha1('mpc', 'gz'),
+        ),
+        (
+            f'mpfr-{mpfr_version}.tar.bz2',
+            f'{gnu}/mpfr/mpfr-{mpfr_version}.tar.bz2',
+            sha1('mpfr', 'bz2'),
+        ),
+        (
+            f'musl-{musl_version}.tar.gz',
+            f'https://musl.libc.org/releases/musl-{musl_version}.tar.gz',
+            sha1('musl', 'gz'),
+        ),
+        (
+            f'musl-cross-make-{musl_cross_version}.zip',
+            f'https://github.com/richfelker/musl-cross-make/archive/refs/tags/'
+            f'v{musl_cross_version}.zip',
+            None,
+        ),
+        (
+            f'qemu-{qemu_version}.tar.xz',
+            f'https://download.qemu.org/qemu-{qemu_version}.tar.xz',
+            None,
+        ),
+        (
+            f'uClibc-ng-{uclibc_version}.tar.xz',
+            f'https://downloads.uclibc-ng.org/releases/{uclibc_version}/'
+            f'uClibc-ng-{uclibc_version}.tar.xz',
+            None,
+        ),
+    ]
+
+def file_digests(path):
+    '''Calculate the SHA1 and SHA256 digests of a file.'''
+
+    sha1 = hashlib.sha1()
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha1.update(chunk)
+            sha256.update(chunk)
+    return sha1.hexdigest(), sha256.hexdigest()
 
 class CleanDistCommand(Command):
     '''A custom command to clean Python dist artifacts.'''
@@ -304,59 +886,215 @@ class CleanCommand(Command):
         shutil.rmtree(f'{HOME}/docker/pkgimages', ignore_errors=True)
         shutil.rmtree(f'{HOME}/musl/config', ignore_errors=True)
         shutil.rmtree(f'{HOME}/symlink/toolchain', ignore_errors=True)
+        for path in (configure_manifest, images_cache):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+# Manifest of the inputs used to configure each output file.
+configure_manifest = f'{HOME}/.configure-manifest.json'
+
+def sha256(data):
+    '''Calculate the SHA256 digest of a string.'''
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+# Template variables, such as `^TRIPLE^` or `^G++^`.
+template_variable = re.compile(r'\^([A-Z][A-Z0-9_+]*)\^')
+
+class Template:
+    '''A template file, parsed once into literal text and variables.'''
+
+    def __init__(self, path, contents):
+        self.path = path
+        self.digest = sha256(contents)
+        # Split alternates literal text and variable names.
+        self.parts = template_variable.split(contents)
+        self.variables = set(self.parts[1::2])
+
+    def render(self, values):
+        '''Render the template in a single pass.'''
+
+        unresolved = self.variables - values.keys()
+        if unresolved:
+            variables = ', '.join(f'^{i}^' for i in sorted(unresolved))
+            raise ValueError(f'Unresolved variables in template {self.path}: {variables}')
+
+        parts = self.parts[:]
+        for index in range(1, len(parts), 2):
+            parts[index] = values[parts[index]]
+        return ''.join(parts)
+
+# Parsed templates, shared by every output that uses them.
+template_cache = {}
+
+def load_template(path):
+    '''Load and parse a template file, using a cached copy if possible.'''
+
+    template = template_cache.get(path)
+    if template is None:
+        with open(path, 'r') as file:
+            template = Template(path, file.read())
+        template_cache[path] = template
+    return template
+
+def replace(templates, replacements):
+    '''Replace template variables with values.'''
+
+    # The first replacement for a variable takes precedence.
+    values = dict(reversed(replacements))
+    return '\n'.join(load_template(i).render(values) for i in templates)
+
+def chmod(file):
+    '''Make a file executable.'''
+
+    flags = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+    st = os.stat(file)
+    os.chmod(file, st.st_mode | flags)
+
+def write_file(path, contents, executable):
+    '''Write a file only if the contents have changed.'''
+
+    try:
+        with open(path, 'r') as file:
+            old_contents = file.read()
+            should_update = old_contents != contents
+    except FileNotFoundError:
+        should_update = True
+
+    if should_update:
+        with open(path, 'w') as file:
+            file.write(contents)
+        if executable:
+            chmod(path)
+
+def configure_output(output):
+    '''Configure an output file from its templates, returning the digest.'''
+
+    templates, outfile, executable, replacements = output
+    contents = replace(templates, replacements)
+    write_file(outfile, contents, executable)
+    return sha256(contents)
+
+def can_fork():
+    '''Check if we can use a process pool without re-running this script.'''
+
+    # Other start methods re-import the main module, which would
+    # re-run `setup()`, so we only use forked processes.
+    has_context = sys.version_info >= (3, 7)
+    return has_context and 'fork' in multiprocessing.get_all_start_methods()
 
 class VersionCommand(Command):
     '''A custom command to configure the library version.'''
 
     description = 'set library version'
-    user_options = []
+    user_options = [
+        ('dry-run', None, 'Report the files that would change, without writing them.'),
+    ]
 
     def initialize_options(self):
-        pass
+        self.outputs = []
 
     def finalize_options(self):
         pass
 
-    def replace(self, string, replacements):
-        '''Replace template variable with value.'''
+    def configure(self, template, outfile, chmod, replacements):
+        '''Configure a template file.'''
+        self.configure_files([template], outfile, chmod, replacements)
 
-        for variable, value in replacements:
-            string = string.replace(f'^{variable}^', value)
-        return string
+    def configure_files(self, templates, outfile, chmod, replacements):
+        '''Schedule an output file configured from a list of templates.'''
+        self.outputs.append((tuple(templates), outfile, chmod, tuple(replacements)))
 
-    def chmod(self, file):
-        '''Make a file executable.'''
+    def manifest_entry(self, output):
+        '''Create the manifest entry for the inputs of an output file.'''
 
-        flags = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
-        st = os.stat(file)
-        os.chmod(file, st.st_mode | flags)
+        templates, _, chmod, replacements = output
+        entry = {
+            'templates': [],
+            'replacements': [list(i) for i in replacements],
+            'chmod': chmod,
+        }
+        for template in templates:
+            digest = load_template(template).digest
+            entry['templates'].append([os.path.relpath(template, HOME), digest])
+        return entry
 
-    def write_file(self, path, contents, chmod):
-        '''Check if we need to write a file.'''
+    def changes(self, outfile, old, new):
+        '''Get the reasons an output file must be regenerated, if any.'''
 
+        if old is None:
+            return ['new output']
         try:
-            with open(path, 'r') as file:
-                old_contents = file.read()
-                should_update = old_contents != contents
+            with open(outfile, 'r') as file:
+                if sha256(file.read()) != old['output']:
+                    return ['output modified']
         except FileNotFoundError:
-            should_update = True
+            return ['output missing']
 
-        if should_update:
-            with open(path, 'w') as file:
-                file.write(contents)
-            if chmod:
-                self.chmod(path)
+        reasons = []
+        old_templates = old['templates']
+        new_templates = new['templates']
+        if [i[0] for i in old_templates] != [i[0] for i in new_templates]:
+            reasons.append('templates changed')
+        else:
+            for (template, digest), (_, old_digest) in zip(new_templates, old_templates):
+                if digest != old_digest:
+                    reasons.append(f'template {template} changed')
+        # The first replacement for a variable takes precedence.
+        old_replacements = dict(reversed(old['replacements']))
+        new_replacements = dict(reversed(new['replacements']))
+        for key in sorted(old_replacements.keys() | new_replacements.keys()):
+            if old_replacements.get(key) != new_replacements.get(key):
+                reasons.append(f'replacement {key} changed')
+        if old['chmod'] != new['chmod']:
+            reasons.append('mode changed')
+        return reasons
+
+    def generate(self):
+        '''Generate all scheduled output files with changed inputs.'''
 
-    def configure(self, template, outfile, chmod, replacements):
-        '''Configure a template file.'''
+        try:
+            with open(configure_manifest, 'r') as file:
+                manifest = json.load(file)
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+
+        # Find every output with changed inputs. This parses every
+        # template before forking, so workers share the cached templates.
+        pending = []
+        for output in self.outputs:
+            outfile = os.path.relpath(output[1], HOME)
+            entry = self.manifest_entry(output)
+            reasons = self.changes(output[1], manifest.get(outfile), entry)
+            if reasons:
+                pending.append((output, outfile, entry, reasons))
+        self.outputs = []
+
+        if self.dry_run:
+            for _, outfile, _, reasons in pending:
+                print(f'{outfile}: {", ".join(reasons)}')
+            return
+
+        # Generate the outputs in parallel: we can have hundreds of them.
+        outputs = [i[0] for i in pending]
+        if len(outputs) > 1 and can_fork():
+            context = multiprocessing.get_context('fork')
+            with concurrent.futures.ProcessPoolExecutor(mp_context=context) as executor:
+                hashes = list(executor.map(configure_output, outputs, chunksize=8))
+        else:
+            hashes = [configure_output(i) for i in outputs]
 
-        with open(template, 'r') as file:
-            contents = file.read()
-        contents = self.replace(contents, replacements)
-        self.write_file(outfile, contents, chmod)
+        # Only update the manifest once all outputs succeeded.
+        if pending:
+            for (_, outfile, entry, _), digest in zip(pending, hashes):
+                entry['output'] = digest
+                manifest[outfile] = entry
+            with open(configure_manifest, 'w') as file:
+                json.dump(manifest, file, indent=4, sort_keys=True)
 
-    def run(self):
-        '''Modify the library version.'''
+    def configure_version(self):
+        '''Configure the library version.'''
 
         version_info = f"""
         version_info(
@@ -382,6 +1120,12 @@ class VersionCommand(Command):
             ('VERSION', f"'{version}'"),
         ])
 
+    def run(self):
+        '''Modify the library version.'''
+
+        self.configure_version()
+        self.generate()
+
 class TagCommand(Command):
     '''Scripts to automatically tag new versions.'''
 
@@ -444,11 +1188,11 @@ class BuildImageCommand(Command):
         assert self.target is not None
         parse_literal(self, 'with_package_managers', None, bool_type)
 
-    def build_image(self, docker):
+    def build_image(self, docker, target, with_package_managers=False):
         '''Build a Docker image.'''
 
-        if build_image(docker, self.target, self.with_package_managers) != 0:
-            print(f'Error: failed to build target {self.target}', file=sys.stderr)
+        if build_image(docker, target, with_package_managers) != 0:
+            print(f'Error: failed to build target {target}', file=sys.stderr)
             sys.exit(1)
 
     def run(self):
@@ -457,7 +1201,11 @@ class BuildImageCommand(Command):
         docker = shutil.which('docker')
         if not docker:
             raise FileNotFoundError('Unable to find command docker.')
-        self.build_image(docker)
+        # Target images start from the shared images.
+        if not self.with_package_managers:
+            for dependency in image_dependencies(self.target):
+                self.build_image(docker, dependency)
+        self.build_image(docker, self.target, self.with_package_managers)
 
 class BuildImagesCommand(Command):
     '''Build all Docker images.'''
@@ -467,21 +1215,72 @@ class BuildImagesCommand(Command):
         ('start=', None, 'Start point for images to build.'),
         ('stop=', None, 'Stop point for images to build.'),
         ('with-package-managers=', None, 'Build package manager images.'),
+        ('cpus=', None, 'CPUs available for all builds. Defaults to all CPUs.'),
+        ('memory=', None, 'Memory available for all builds, in GB. Defaults to all memory.'),
+        ('disk=', None, 'Minimum free disk space to start a build, in GB.'),
+        ('build-cpus=', None, 'CPUs reserved for each build. Defaults to the build jobs.'),
+        ('build-memory=', None, 'Memory reserved for each build, in GB.'),
+        ('force=', None, 'Rebuild images even if their inputs are unchanged.'),
+        ('resume=', None, 'Resume the last build, skipping completed images.'),
+        ('retry-failed=', None, 'Only rebuild the images that failed in the last build.'),
+        ('telemetry=', None, 'Record build time and image size telemetry. Defaults to true.'),
+        ('compressed-size=', None, 'Also record the compressed image size, exporting each image.'),
+        ('compression=', None, 'Compression for image layers, such as zstd.'),
     ]
 
     def initialize_options(self):
         self.start = None
         self.stop = None
         self.with_package_managers = None
+        self.cpus = None
+        self.memory = None
+        self.disk = None
+        self.build_cpus = None
+        self.build_memory = None
+        self.force = None
+        self.resume = None
+        self.retry_failed = None
+        self.telemetry = None
+        self.compressed_size = None
+        self.compression = None
 
     def finalize_options(self):
         parse_literal(self, 'with_package_managers', None, bool_type)
+        parse_literal(self, 'force', None, bool_type)
+        parse_literal(self, 'resume', None, bool_type)
+        parse_literal(self, 'retry_failed', None, bool_type)
+        parse_literal(self, 'telemetry', None, bool_type)
+        parse_literal(self, 'compressed_size', None, bool_type)
+        parse_literal(self, 'cpus', None, int_type)
+        parse_literal(self, 'memory', None, number_type)
+        parse_literal(self, 'disk', None, number_type)
+        parse_literal(self, 'build_cpus', None, int_type)
+        parse_literal(self, 'build_memory', None, number_type)
+        if self.cpus is None:
+            self.cpus = os.cpu_count() or 1
+        if self.memory is None:
+            self.memory = total_memory()
+        if self.disk is None:
+            self.disk = 20
+        if self.build_cpus is None:
+            self.build_cpus = int(config['options']['build_jobs'])
+        if self.build_memory is None:
+            self.build_memory = 4
+        if self.telemetry is None:
+            self.telemetry = True
 
     def build_image(self, docker, target, with_package_managers=False):
         '''Build a Docker image.'''
 
-        if build_image(docker, target, with_package_managers) != 0:
-            self.failures.append(target)
+        log = None
+        if self.jobs > 1:
+            image_dir = 'pkgimages' if with_package_managers else 'images'
+            log = f'{HOME}/build/logs/{image_dir}/{target}.log'
+        print(f'Building {image_from_target(target, with_package_managers)}.')
+        code = build_image(docker, target, with_package_managers, log, self.compression)
+        if code != 0:
+            if log is not None:
+                print(f'Error: failed to build target {target}, see {log}.', file=sys.stderr)
             return False
         return True
 
@@ -490,24 +1289,209 @@ class BuildImagesCommand(Command):
 
         image = image_from_target(target, with_package_managers)
         tag = image_from_target(tag_name, with_package_managers)
-        check_call(subprocess.call([docker, 'tag', image, tag]))
+        return subprocess.call([docker, 'tag', image, tag]) == 0
 
-    def build_versions(self, docker, target, with_pkg=False):
-        '''Build all versions of a given target.'''
+    def tag_all(self, docker, target, with_pkg=False):
+        '''Tag all versions and aliases of a given target.'''
 
-        if not self.build_image(docker, target, with_pkg):
-            return
         for version in semver():
-            self.tag_image(docker, target, f'{target}-{version}', with_pkg)
+            if not self.tag_image(docker, target, f'{target}-{version}', with_pkg):
+                return False
+        for alias in target_aliases(target):
+            if not self.tag_versions(docker, target, alias, with_pkg):
+                return False
         if target.endswith('-unknown-linux-gnu'):
-            self.tag_versions(docker, target, target[:-len('-unknown-linux-gnu')], with_pkg)
+            tag_name = target[:-len('-unknown-linux-gnu')]
+            return self.tag_versions(docker, target, tag_name, with_pkg)
+        return True
 
     def tag_versions(self, docker, target, tag_name, with_pkg=False):
         '''Build all versions of a given target.'''
 
-        self.tag_image(docker, target, tag_name, with_pkg)
+        if not self.tag_image(docker, target, tag_name, with_pkg):
+            return False
         for version in semver():
-            self.tag_image(docker, target, f'{tag_name}-{version}', with_pkg)
+            if not self.tag_image(docker, target, f'{tag_name}-{version}', with_pkg):
+                return False
+        return True
+
+    def build_graph(self):
+        '''Create the dependency graph of images to build.'''
+
+        # Each node is a `(target, with_pkg)` pair, mapping to
+        # the nodes it depends on. The target images start from
+        # the shared base image, and copy from the shared builder
+        # images, and the package images use the target image and
+        # the vcpkg image as build stages.
+        graph = {}
+        vcpkg = ('vcpkg', True)
+        if self.with_package_managers:
+            graph[vcpkg] = set()
+
+        def add_image(target):
+            node = (target, False)
+            if node not in graph:
+                path = f'{HOME}/docker/images/Dockerfile.{target}'
+                graph[node] = {(i, False) for i in dockerfile_images(path)}
+                for dependency, _ in graph[node]:
+                    add_image(dependency)
+
+        add_image('base')
+        for target in subslice_targets(self.start, self.stop):
+            add_image(target)
+            if not self.with_package_managers:
+                continue
+            if os.path.exists(f'{HOME}/docker/pkgimages/Dockerfile.{target}'):
+                graph[(target, True)] = {(target, False), vcpkg}
+        return graph
+
+    def graph_digests(self, graph):
+        '''Calculate the content hash of each image in the dependency graph.'''
+
+        digests = {}
+
+        def visit(node):
+            if node not in digests:
+                dependencies = [visit(i) for i in graph[node]]
+                digests[node] = image_digest(*node, dependencies)
+            return digests[node]
+
+        for node in graph:
+            visit(node)
+        return digests
+
+    def load_manifest(self):
+        '''Load the content hashes of the last successful builds.'''
+
+        try:
+            with open(build_manifest) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def save_manifest(self, manifest):
+        '''Save the content hashes of the last successful builds.'''
+
+        with open(build_manifest, 'w') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+    def max_jobs(self):
+        '''Get the maximum number of concurrent builds for the resource limits.'''
+
+        jobs = self.cpus // self.build_cpus
+        if self.memory is not None:
+            jobs = min(jobs, int(self.memory // self.build_memory))
+        return max(jobs, 1)
+
+    def is_complete(self, node, state):
+        '''Check if the journaled state of an image is final.'''
+
+        # The shared images are never tagged.
+        if node[0] in shared_images:
+            return state in ('built', 'tagged')
+        return state == 'tagged'
+
+    def build_node(self, docker, node):
+        '''Build a single node in the dependency graph.'''
+
+        target, with_pkg = node
+        image = image_from_target(target, with_pkg)
+        start = time.time()
+        self.journal.update(image, state='building', started=start, duration=None, id=None)
+        if not self.build_image(docker, target, with_pkg):
+            self.journal.update(image, state='failed', duration=time.time() - start)
+            return False
+        self.journal.update(image, state='built', id=image_id(docker, image))
+
+        # The shared images are never tagged.
+        if target not in shared_images:
+            if not self.tag_all(docker, target, with_pkg):
+                self.journal.update(image, state='failed', duration=time.time() - start)
+                return False
+            self.journal.update(image, state='tagged')
+        duration = time.time() - start
+        self.journal.update(image, duration=duration)
+        if self.telemetry:
+            record_image_telemetry(docker, image, duration, self.compressed_size)
+        return True
+
+    def build_all(self, docker, graph):
+        '''Build all images in dependency order, in parallel when possible.'''
+
+        disk_path = docker_root(docker)
+        pending = dict(graph)
+        running = {}
+        built = set()
+        failed = set()
+        failures = []
+
+        # Skip any images completed in the journaled build, or whose
+        # inputs match the last successful build.
+        digests = self.graph_digests(graph)
+        manifest = self.load_manifest()
+        for node in graph:
+            image = image_from_target(*node)
+            state = self.journal.get(image).get('state')
+            if self.retry_failed and state != 'failed':
+                skip = True
+            elif self.resume and self.is_complete(node, state):
+                skip = True
+            elif not self.force and manifest.get(image) == digests[node]:
+                print(f'Skipping unchanged image {image}.')
+                skip = True
+            else:
+                skip = False
+            if skip:
+                del pending[node]
+                built.add(node)
+            else:
+                self.journal.update(image, state='pending')
+
+        executor = concurrent.futures.ThreadPoolExecutor(self.jobs)
+        with executor:
+            while pending or running:
+                # Skip any images that depend on failed images.
+                for node, dependencies in list(pending.items()):
+                    if dependencies & failed:
+                        del pending[node]
+                        failed.add(node)
+                        failures.append(node)
+                        self.journal.update(image_from_target(*node), state='failed')
+
+                # Start every ready image the resource limits allow.
+                ready = [i for i, j in pending.items() if j <= built]
+                for node in ready:
+                    if len(running) >= self.jobs:
+                        break
+                    if free_disk(disk_path) < self.disk:
+                        if not running:
+                            message = f'Error: less than {self.disk} GB free disk space.'
+                            print(message, file=sys.stderr)
+                        break
+                    del pending[node]
+                    running[executor.submit(self.build_node, docker, node)] = node
+
+                if not running:
+                    # Nothing can make progress, so stop scheduling.
+                    failures += list(pending)
+                    break
+
+                finished, _ = concurrent.futures.wait(
+                    running,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in finished:
+                    node = running.pop(future)
+                    if future.result():
+                        built.add(node)
+                        manifest[image_from_target(*node)] = digests[node]
+                        self.save_manifest(manifest)
+                    else:
+                        failed.add(node)
+                        failures.append(node)
+
+        return failures
 
     def run(self):
         '''Build all Docker images.'''
@@ -516,44 +1500,28 @@ class BuildImagesCommand(Command):
         if not docker:
             raise FileNotFoundError('Unable to find command docker.')
 
-        # Need to build our base vcpkg for package files.
-        if self.with_package_managers:
-            if build_image(docker, 'vcpkg', True) != 0:
-                print('Error: failed to build target vcpkg', file=sys.stderr)
-                sys.exit(1)
-
-        # Build all our Docker images.
-        self.failures = []
-        for target in subslice_targets(self.start, self.stop):
-            self.build_versions(docker, target)
-            # Only build if the previous image succeeded, and if
-            # the image with a package manager exists.
-            if self.failures and self.failures[-1] == target:
-                continue
-            elif not self.with_package_managers:
-                continue
-            if os.path.exists(f'{HOME}/docker/pkgimages/Dockerfile.{target}'):
-                self.build_versions(docker, target, with_pkg=True)
+        # Build all our Docker images, starting a new journal
+        # unless we're continuing the last build.
+        graph = self.build_graph()
+        self.jobs = min(self.max_jobs(), len(graph) or 1)
+        if self.resume or self.retry_failed:
+            self.journal = BuildJournal.load(build_journal)
+        else:
+            self.journal = BuildJournal(build_journal)
+        failures = self.build_all(docker, graph)
 
         # Print any failures.
-        if self.failures:
+        if failures:
             print('Error: Failures occurred.', file=sys.stderr)
             print('-------------------------', file=sys.stderr)
-            for failure in self.failures:
-                print(failure, file=sys.stderr)
+            for target, with_pkg in failures:
+                print(image_from_target(target, with_pkg), file=sys.stderr)
             sys.exit(1)
 
 class BuildAllCommand(BuildImagesCommand):
     '''Build Docker images and the Python library for dist.'''
 
     description = 'build all docker images and wheels for release'
-    user_options = []
-
-    def initialize_options(self):
-        pass
-
-    def finalize_options(self):
-        pass
 
     def run(self):
         '''Build all images and package for release.'''
@@ -589,36 +1557,96 @@ class PushCommand(Command):
         ('start=', None, 'Start point for images to push.'),
         ('stop=', None, 'Stop point for images to push.'),
         ('with-package-managers=', None, 'Build package manager images.'),
+        ('jobs=', None, 'Number of concurrent pushes.'),
+        ('retries=', None, 'Number of times to retry a failed push.'),
+        ('server=', None, 'Registry to push to. Defaults to Docker Hub.'),
+        ('insecure=', None, 'Allow connecting to an insecure (HTTP) registry.'),
     ]
 
     def initialize_options(self):
         self.start = None
         self.stop = None
         self.with_package_managers = None
+        self.jobs = None
+        self.retries = None
+        self.server = None
+        self.insecure = None
 
     def finalize_options(self):
         parse_literal(self, 'with_package_managers', None, bool_type)
+        parse_literal(self, 'jobs', None, int_type)
+        parse_literal(self, 'retries', None, int_type)
+        parse_literal(self, 'insecure', None, bool_type)
+        if self.jobs is None:
+            self.jobs = 4
+        if self.retries is None:
+            self.retries = 3
+
+    def image_tags(self, target, with_package_managers=False):
+        '''Get all tags to push for a given target.'''
+
+        names = [target] + target_aliases(target)
+        if target.endswith('-unknown-linux-gnu'):
+            names.append(target[:-len('-unknown-linux-gnu')])
+        tags = []
+        for name in names:
+            tags.append(name)
+            tags += [f'{name}-{version}' for version in semver()]
+        return [image_from_target(i, with_package_managers) for i in tags]
+
+    def remote_image(self, image):
+        '''Get the name of an image in the registry.'''
+
+        if self.server is None:
+            return image
+        return f'{self.server}/{image}'
+
+    def remote_digest(self, docker, image):
+        '''Get the config digest of an image in the registry, or None if it does not exist.'''
+
+        command = [docker, 'manifest', 'inspect']
+        if self.insecure:
+            command.append('--insecure')
+        command.append(image)
+        process = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        if process.returncode != 0:
+            return None
+        try:
+            manifest = json.loads(process.stdout)
+            return manifest['config']['digest']
+        except (ValueError, KeyError, TypeError):
+            return None
 
-    def push_image(self, docker, target, with_package_managers=False):
-        '''Push an image to Docker Hub.'''
-
-        image = image_from_target(target, with_package_managers)
-        check_call(subprocess.call([docker, 'push', image]))
-
-    def push_versions(self, docker, target, with_package_managers=False):
-        '''Push all versions of a given target.'''
+    def push_image(self, docker, image):
+        '''Push a single image tag, retrying on failure. Returns if it succeeded.'''
 
-        self.push_image(docker, target, with_package_managers)
-        for version in semver():
-            self.push_image(docker, f'{target}-{version}', with_package_managers)
+        local_digest = image_id(docker, image)
+        if local_digest is None:
+            print(f'Error: image {image} does not exist.', file=sys.stderr)
+            return False
 
-    def push_target(self, docker, target, with_package_managers=False):
-        '''Push all images for a given target.'''
+        remote = self.remote_image(image)
+        if self.remote_digest(docker, remote) == local_digest:
+            print(f'Skipping unchanged image {remote}.')
+            return True
+        if remote != image and subprocess.call([docker, 'tag', image, remote]) != 0:
+            return False
 
-        self.push_versions(docker, target, with_package_managers)
-        if target.endswith('-unknown-linux-gnu'):
-            base = target[:-len('-unknown-linux-gnu')]
-            self.push_versions(docker, base, with_package_managers)
+        # Back off exponentially between retries, since most
+        # failures are from rate limits or transient network errors.
+        for attempt in range(self.retries + 1):
+            if attempt != 0:
+                time.sleep(2 ** attempt)
+                print(f'Retrying push of {remote}.')
+            command = [docker, 'push', remote]
+            if subprocess.call(command, stdout=subprocess.DEVNULL) == 0:
+                print(f'Pushed {remote}.')
+                return True
+        return False
 
     def run(self):
         '''Push all Docker images to Docker hub.'''
@@ -627,13 +1655,126 @@ class PushCommand(Command):
         if not docker:
             raise FileNotFoundError('Unable to find command docker.')
 
-        # Push all our Docker images.
+        # Collect all our Docker images.
+        images = []
         for target in subslice_targets(self.start, self.stop):
-            self.push_target(docker, target)
+            images += self.image_tags(target)
             if not self.with_package_managers:
                 continue
             if os.path.exists(f'{HOME}/docker/pkgimages/Dockerfile.{target}'):
-                self.push_target(docker, target, with_package_managers=True)
+                images += self.image_tags(target, with_package_managers=True)
+
+        # Push all our Docker images.
+        with concurrent.futures.ThreadPoolExecutor(self.jobs) as executor:
+            futures = [executor.submit(self.push_image, docker, i) for i in images]
+            results = [i.result() for i in futures]
+        failures = [i for i, j in zip(images, results) if not j]
+
+        # Print any failures.
+        if failures:
+            print('Error: Failures occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for failure in failures:
+                print(self.remote_image(failure), file=sys.stderr)
+            sys.exit(1)
+
+class FetchSourcesCommand(Command):
+    '''Download all versioned source archives into a local mirror.'''
+
+    description = 'download source archives into a local mirror'
+    user_options = [
+        ('jobs=', None, 'Number of concurrent downloads.'),
+    ]
+
+    def initialize_options(self):
+        self.jobs = None
+
+    def finalize_options(self):
+        parse_literal(self, 'jobs', None, int_type)
+        if self.jobs is None:
+            self.jobs = 4
+
+    def load_checksums(self):
+        '''Load the SHA256 checksums of the mirrored archives.'''
+
+        checksums = {}
+        try:
+            with open(sources_checksums, 'r') as file:
+                for line in file:
+                    digest, filename = line.split()
+                    checksums[filename] = digest
+        except FileNotFoundError:
+            pass
+        return checksums
+
+    def is_valid(self, path, sha1, sha256):
+        '''Check if a mirrored archive exists and matches its checksums.'''
+
+        if not os.path.exists(path) or (sha1 is None and sha256 is None):
+            return False
+        actual_sha1, actual_sha256 = file_digests(path)
+        if sha1 is not None and actual_sha1 != sha1:
+            return False
+        return sha256 is None or actual_sha256 == sha256
+
+    def fetch(self, filename, url, sha1, sha256):
+        '''Download a single archive, returning the SHA256 or None on failure.'''
+
+        path = f'{sources_directory}/{filename}'
+        if self.is_valid(path, sha1, sha256):
+            return sha256 or file_digests(path)[1]
+
+        # Download to a temporary file, so a failed download
+        # never leaves a partial archive in the mirror.
+        print(f'Downloading {url}.')
+        fd, tmp = tempfile.mkstemp(dir=sources_directory, prefix=f'.{filename}.')
+        try:
+            with os.fdopen(fd, 'wb') as file, urllib.request.urlopen(url) as response:
+                shutil.copyfileobj(response, file)
+            actual_sha1, actual_sha256 = file_digests(tmp)
+            if sha1 is not None and actual_sha1 != sha1:
+                print(f'Error: SHA1 mismatch for {filename}.', file=sys.stderr)
+                return None
+            os.replace(tmp, path)
+            return actual_sha256
+        except OSError as error:
+            print(f'Error: unable to download {url}: {error}.', file=sys.stderr)
+            return None
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def run(self):
+        '''Download all source archives.'''
+
+        os.makedirs(sources_directory, exist_ok=True)
+        checksums = self.load_checksums()
+        archives = source_archives()
+        with concurrent.futures.ThreadPoolExecutor(self.jobs) as executor:
+            futures = []
+            for filename, url, sha1 in archives:
+                sha256 = checksums.get(filename)
+                futures.append(executor.submit(self.fetch, filename, url, sha1, sha256))
+            digests = [i.result() for i in futures]
+
+        # Record the checksums, in the format used by `sha256sum`.
+        failures = []
+        for (filename, _, _), digest in zip(archives, digests):
+            if digest is None:
+                failures.append(filename)
+            else:
+                checksums[filename] = digest
+        with open(sources_checksums, 'w') as file:
+            for filename in sorted(checksums):
+                file.write(f'{checksums[filename]}  {filename}\n')
+
+        # Print any failures.
+        if failures:
+            print('Error: Failures occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for failure in failures:
+                print(failure, file=sys.stderr)
+            sys.exit(1)
 
 class PublishCommand(Command):
     '''Publish a Python version.'''
@@ -714,6 +1855,12 @@ class TestImagesCommand(Command):
         ('stop=', None, 'Stop point for test suite.'),
         ('os=', None, 'Do operating system tests tests.'),
         ('metal=', None, 'Do bare-metal tests.'),
+        ('jobs=', None, 'Number of concurrent tests. Defaults to all CPUs.'),
+        ('junit=', None, 'Write the results as a JUnit XML report.'),
+        ('json=', None, 'Write the results as a JSON report.'),
+        ('shard=', None, 'Only run shard K of N, for example, 2/4.'),
+        ('durations=', None, 'JSON reports shared by all shards to balance them, comma-separated.'),
+        ('affected-since=', None, 'Only test images affected by changes since a git revision.'),
     ]
     metal_tests = [
         'arm',
@@ -730,34 +1877,48 @@ class TestImagesCommand(Command):
     def initialize_options(self):
         self.start = None
         self.stop = None
-        self.os = True
+        self.os = None
         self.metal = None
+        self.jobs = None
+        self.junit = None
+        self.json = None
+        self.shard = None
+        self.durations = None
+        self.affected_since = None
 
     def finalize_options(self):
         parse_literal(self, 'os', None, bool_type)
         parse_literal(self, 'metal', None, bool_type)
+        parse_literal(self, 'jobs', None, int_type)
+        if self.os is None:
+            self.os = True
+        if self.jobs is None:
+            self.jobs = os.cpu_count() or 1
+        if self.shard is not None:
+            # Every machine must balance the shards from the same
+            # durations, or the shards will overlap or miss tests.
+            if self.durations is None:
+                raise ValueError('Must provide shared test durations with --durations to shard.')
+            match = re.match(r'^(\d+)/(\d+)$', self.shard)
+            if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+                raise ValueError(f'Invalid shard "{self.shard}", must be K/N with 1 <= K <= N.')
+            self.shard = (int(match.group(1)), int(match.group(2)))
 
     def git_clone(self, git, repository):
         '''Clone a given repository.'''
         check_call(subprocess.call([git, 'clone', repository, f'{HOME}/buildtests']))
 
-    def run_test(
+    def test_case(
         self,
-        docker,
         target,
         os_type,
+        name=None,
+        project=None,
         script=None,
         cpu=None,
         **envvars
     ):
-        '''Run test for a single target.'''
-
-        # Get our command.
-        if script is None:
-            script = 'image-test'
-        command = f'/test/{script}.sh'
-        if cpu is not None:
-            command = f'export CPU={cpu}; {command}'
+        '''Create the test for a single target.'''
 
         # Check for additional flags.
         if self.nostartfiles(target):
@@ -768,23 +1929,78 @@ class TestImagesCommand(Command):
                 flags = '-nostartfiles'
             envvars['FLAGS'] = flags
 
+        return {
+            'name': name or target,
+            'target': target,
+            'type': os_type,
+            'project': project,
+            'script': script or 'image-test',
+            'cpu': cpu,
+            'env': envvars,
+            'skip': self.skip(target),
+        }
+
+    def run_test(self, docker, test):
+        '''Run the test for a single target, returning the result.'''
+
+        result = {
+            'name': test['name'],
+            'image': image_from_target(test['target']),
+            'type': test['type'],
+            'status': 'skipped',
+            'duration': 0,
+            'log': None,
+        }
+        if test['skip']:
+            return result
+
+        # Get our command.
+        command = f'/test/{test["script"]}.sh'
+        if test['cpu'] is not None:
+            command = f'export CPU={test["cpu"]}; {command}'
+
+        # Every test uses its own copy of the tests and the test
+        # project, and a unique container name, so tests can run
+        # concurrently.
+        os.makedirs(f'{HOME}/build/tests', exist_ok=True)
+        testdir = tempfile.mkdtemp(prefix=f'{test["name"]}-', dir=f'{HOME}/build/tests')
+        ignore = shutil.ignore_patterns('buildtests', '__pycache__', '.pytest_cache')
+        shutil.copytree(f'{HOME}/test', testdir, ignore=ignore, dirs_exist_ok=True)
+        if test['project'] is not None:
+            shutil.copytree(f'{HOME}/test/{test["project"]}', f'{testdir}/buildtests')
+
         # Build and call our docker command.
         docker_command = [
             docker,
             'run',
-            '--name', f'xcross-test-{target}',
-            '-v', f'{HOME}/test:/test',
-            '--env', f'IMAGE={target}',
-            '--env', f'TYPE={os_type}',
+            '--rm',
+            '--name', f'xcross-test-{test["name"]}-{os.getpid()}',
+            '-v', f'{testdir}:/test',
+            '--env', f'IMAGE={test["target"]}',
+            '--env', f'TYPE={test["type"]}',
         ]
-        for key, value in envvars.items():
+        for key, value in test['env'].items():
             docker_command += ['--env', f'{key}={value}']
-        docker_command.append(image_from_target(target))
+        docker_command.append(result['image'])
         docker_command += ['/bin/bash', '-c', command]
-        subprocess.check_call(docker_command)
 
-        # Clean up our stoppd container.
-        subprocess.check_call([docker, 'rm', f'xcross-test-{target}'])
+        # Concurrent tests write their output to a log, rather
+        # than interleaving output.
+        print(f'Testing {test["name"]}.')
+        start = time.time()
+        try:
+            if self.jobs > 1:
+                result['log'] = f'{HOME}/build/logs/tests/{test["name"]}.log'
+                os.makedirs(os.path.dirname(result['log']), exist_ok=True)
+                with open(result['log'], 'w') as file:
+                    code = subprocess.call(docker_command, stdout=file, stderr=subprocess.STDOUT)
+            else:
+                code = subprocess.call(docker_command)
+        finally:
+            result['duration'] = time.time() - start
+            shutil.rmtree(testdir, ignore_errors=True)
+        result['status'] = 'passed' if code == 0 else 'failed'
+        return result
 
     def nostartfiles(self, target):
         '''Check if an image does not have startfiles.'''
@@ -810,13 +2026,14 @@ class TestImagesCommand(Command):
         #   undefined reference to `_savegpr_29`.
         return target == 'ppcle-unknown-elf'
 
-    def run_wasm(self, docker, **envvars):
-        '''Run a web-assembly target.'''
+    def wasm_case(self, name, **envvars):
+        '''Create the test for a web-assembly target.'''
 
-        self.run_test(
-            docker,
+        return self.test_case(
             'wasm',
             'script',
+            name=name,
+            project='cpp-helloworld',
             **envvars,
             NO_PERIPHERALS='1',
             TOOLCHAIN1='jsonly',
@@ -825,73 +2042,128 @@ class TestImagesCommand(Command):
             TOOLCHAIN2_FLAGS='-s WASM=1',
         )
 
-    def run_os(self, docker):
-        '''Run the tests with an operating system.'''
+    def os_cases(self):
+        '''Create the tests for the images with an operating system.'''
 
         # Configure our test runner.
         has_started = True
         has_stopped = False
         if self.start is not None:
             has_started = False
-        metal_images = sorted([i.target for i in images if i.os.is_baremetal()])
-        os_images = sorted([i.target for i in images if i.os.is_os()])
+        registry = get_registry()
+        metal_images = sorted([i.target for i in registry.select(os='baremetal')])
+        os_images = sorted([i.target for i in registry.select(os=('android', 'linux', 'windows'))])
+        tests = []
+
+        # Add OS images.
+        for target in os_images:
+            if has_started or self.start == target:
+                has_started = True
+                tests.append(self.test_case(target, 'os', project='cpp-helloworld'))
+
+            if self.stop == target:
+                has_stopped = True
+                break
+
+        # Add the special images.
+        if has_started and not has_stopped:
+            project = 'cpp-helloworld'
+            tests += [
+                self.wasm_case('wasm'),
+                self.wasm_case('wasm-js-only', CMAKE_FLAGS='-DJS_ONLY=1'),
+                self.test_case(
+                    os_images[0],
+                    'os',
+                    name=f'{os_images[0]}-ninja',
+                    project=project,
+                    CMAKE_FLAGS='-GNinja',
+                ),
+                self.wasm_case('wasm-ninja', CMAKE_FLAGS='-GNinja'),
+                self.test_case(
+                    'ppc-unknown-linux-gnu',
+                    'os',
+                    name='ppc-unknown-linux-gnu-e500mc',
+                    project=project,
+                    cpu='e500mc',
+                    NORUN2='1',
+                ),
+                self.test_case(
+                    'ppc64-unknown-linux-gnu',
+                    'os',
+                    name='ppc64-unknown-linux-gnu-power9',
+                    project=project,
+                    cpu='power9',
+                ),
+                self.test_case(
+                    'mips-unknown-linux-gnu',
+                    'os',
+                    name='mips-unknown-linux-gnu-24Kf',
+                    project=project,
+                    cpu='24Kf',
+                ),
+            ]
+        if has_stopped:
+            return tests
 
-        # Run OS images.
-        testdir = f'{HOME}/test/buildtests'
-        shutil.copytree(f'{HOME}/test/cpp-helloworld', testdir, dirs_exist_ok=True)
-        try:
-            for target in os_images:
-                if has_started or self.start == target:
-                    has_started = True
-                    if not self.skip(target):
-                        self.run_test(docker, target, 'os')
-
-                if self.stop == target:
-                    has_stopped = True
-                    break
+        # Add metal images.
+        for target in metal_images:
+            if has_started or self.start == target:
+                has_started = True
+                tests.append(self.test_case(target, 'metal', project='cpp-atoi'))
 
-            # Run the special images.
-            if has_started and not has_stopped:
-                self.run_wasm(docker)
-                self.run_wasm(docker, CMAKE_FLAGS='-DJS_ONLY=1')
-                self.run_test(docker, os_images[0], 'os', CMAKE_FLAGS='-GNinja')
-                self.run_wasm(docker, CMAKE_FLAGS='-GNinja')
-                self.run_test(docker, 'ppc-unknown-linux-gnu', 'os', cpu='e500mc', NORUN2='1')
-                self.run_test(docker, 'ppc64-unknown-linux-gnu', 'os', cpu='power9')
-                self.run_test(docker, 'mips-unknown-linux-gnu', 'os', cpu='24Kf')
-        finally:
-            shutil.rmtree(testdir, ignore_errors=True)
-        if has_stopped:
-            return
+            if self.stop == target:
+                break
 
-        # Run metal images.
-        shutil.copytree(f'{HOME}/test/cpp-atoi', testdir, dirs_exist_ok=True)
-        try:
-            for target in metal_images:
-                if has_started or self.start == target:
-                    has_started = True
-                    if not self.skip(target):
-                        self.run_test(docker, target, 'metal')
-
-                if self.stop == target:
-                    has_stopped = True
-                    break
-        finally:
-            shutil.rmtree(testdir, ignore_errors=True)
-        if has_stopped:
-            return
+        return tests
 
-    def run_metal(self, docker):
-        '''Run the bare-metal tests.'''
+    def metal_cases(self):
+        '''Create the bare-metal hardware tests.'''
 
+        tests = []
         for arch in self.metal_tests:
             if isinstance(arch, tuple):
                 image = f'{arch[0]}-unknown-elf'
                 script = f'{arch[1]}-hw'
             else:
-                image = f'{arch}-unknown-elf',
+                image = f'{arch}-unknown-elf'
                 script = f'{arch}-hw'
-            self.run_test(docker, image, 'metal', script=script)
+            tests.append(self.test_case(image, 'metal', name=script, script=script))
+        return tests
+
+    def write_junit(self, results):
+        '''Write the results as a JUnit XML report.'''
+
+        failures = [i for i in results if i['status'] == 'failed']
+        skipped = [i for i in results if i['status'] == 'skipped']
+        suite = ElementTree.Element('testsuite', {
+            'name': 'xcross',
+            'tests': str(len(results)),
+            'failures': str(len(failures)),
+            'skipped': str(len(skipped)),
+            'time': f'{sum(i["duration"] for i in results):.3f}',
+        })
+        for result in results:
+            case = ElementTree.SubElement(suite, 'testcase', {
+                'classname': f'xcross.{result["type"]}',
+                'name': result['name'],
+                'time': f'{result["duration"]:.3f}',
+            })
+            if result['status'] == 'failed':
+                failure = ElementTree.SubElement(case, 'failure', {
+                    'message': f'failed to test image {result["image"]}',
+                })
+                if result['log'] is not None:
+                    failure.text = f'See {result["log"]}.'
+            elif result['status'] == 'skipped':
+                ElementTree.SubElement(case, 'skipped')
+        ElementTree.ElementTree(suite).write(self.junit, encoding='utf-8', xml_declaration=True)
+
+    def write_json(self, results):
+        '''Write the results as a JSON report.'''
+
+        with open(self.json, 'w') as file:
+            json.dump(results, file, indent=2)
+            file.write('\n')
 
     def run(self):
         '''Run the docker test suite.'''
@@ -901,10 +2173,43 @@ class TestImagesCommand(Command):
         if not docker:
             raise FileNotFoundError('Unable to find command docker.')
 
+        tests = []
         if self.os:
-            self.run_os(docker)
+            tests += self.os_cases()
         if self.metal:
-            self.run_metal(docker)
+            tests += self.metal_cases()
+        if self.affected_since is not None:
+            targets = {i['target'] for i in tests}
+            affected = affected_targets(self.affected_since, targets)
+            tests = [i for i in tests if i['target'] in affected]
+            print(f'Testing {len(affected)} targets affected since {self.affected_since}.')
+        if self.shard is not None:
+            index, count = self.shard
+            durations = load_test_durations(self.durations.split(','))
+            tests, estimate = shard_tests(tests, durations, index, count)
+            print(f'Running shard {index}/{count}: {len(tests)} tests, estimated {estimate:.0f}s.')
+
+        # Run all tests concurrently, keeping the results in order.
+        jobs = max(min(self.jobs, len(tests)), 1)
+        with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+            results = list(executor.map(functools.partial(self.run_test, docker), tests))
+
+        if self.junit is not None:
+            self.write_junit(results)
+        if self.json is not None:
+            self.write_json(results)
+
+        # Print any failures.
+        failures = [i for i in results if i['status'] == 'failed']
+        if failures:
+            print('Error: Failures occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for result in failures:
+                if result['log'] is not None:
+                    print(f'{result["name"]}, see {result["log"]}', file=sys.stderr)
+                else:
+                    print(result['name'], file=sys.stderr)
+            sys.exit(1)
 
 class TestAllCommand(TestImagesCommand):
     '''Run the Python and Docker test suites.'''
@@ -915,6 +2220,330 @@ class TestAllCommand(TestImagesCommand):
         self.run_command('test')
         TestImagesCommand.run(self)
 
+class ShellStartupCommand(Command):
+    '''Measure the shell startup time of the Docker images.'''
+
+    description = 'measure shell startup time of docker images'
+    user_options = [
+        ('start=', None, 'Start point for images to measure.'),
+        ('stop=', None, 'Stop point for images to measure.'),
+        ('iterations=', None, 'Number of shells to start per measurement.'),
+        ('output=', None, 'Path to write the JSON results to.'),
+    ]
+
+    def initialize_options(self):
+        self.start = None
+        self.stop = None
+        self.iterations = None
+        self.output = None
+
+    def finalize_options(self):
+        parse_literal(self, 'iterations', None, int_type)
+        if self.iterations is None:
+            self.iterations = 20
+
+    def measure(self, docker, target):
+        '''Measure the shell startup time for a single target.'''
+
+        command = [
+            docker,
+            'run',
+            '--rm',
+            '-v', f'{HOME}/test:/test',
+            '--env', f'ITERATIONS={self.iterations}',
+            '--env', 'QUIET=1',
+            image_from_target(target),
+            '/bin/bash', '/test/shell-startup.sh',
+        ]
+        with subprocess.Popen(command, stdout=subprocess.PIPE) as process:
+            stdout, _ = process.communicate()
+        if process.returncode != 0:
+            return None
+        return json.loads(stdout.decode('utf-8').splitlines()[-1])
+
+    def run(self):
+        '''Measure the shell startup time of all images.'''
+
+        docker = shutil.which('docker')
+        if not docker:
+            raise FileNotFoundError('Unable to find command docker.')
+
+        # All times are the mean, in microseconds.
+        results = {}
+        failures = []
+        print(f'{"target":<48}{"bare":>10}{"profile":>10}{"login":>10}{"snapshot":>10}')
+        for target in subslice_targets(self.start, self.stop):
+            result = self.measure(docker, target)
+            if result is None:
+                failures.append(target)
+                continue
+            results[target] = result
+            snapshot = result['snapshot']
+            if snapshot is None:
+                snapshot = '-'
+            print(
+                f'{target:<48}{result["bare"]:>10}{result["profile"]:>10}'
+                f'{result["interactive"]:>10}{snapshot:>10}'
+            )
+
+        if self.output is not None:
+            with open(self.output, 'w') as file:
+                json.dump(results, file, indent=4)
+
+        # Print any failures.
+        if failures:
+            print('Error: Failures occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for failure in failures:
+                print(failure, file=sys.stderr)
+            sys.exit(1)
+
+class BenchmarkCommand(Command):
+    '''Benchmark the toolchain and emulator of the Docker images.'''
+
+    description = 'benchmark toolchain and emulator performance of docker images'
+    user_options = [
+        ('start=', None, 'Start point for images to benchmark.'),
+        ('stop=', None, 'Stop point for images to benchmark.'),
+        ('iterations=', None, 'Number of times to run each workload. Defaults to 3.'),
+        ('with-package-managers=', None, 'Benchmark package manager images, including zlib.'),
+        ('output=', None, 'Path to write the JSON results to.'),
+        ('baseline=', None, 'Path to the JSON results to compare against.'),
+        ('update-baseline=', None, 'Store the results as the new baseline.'),
+        ('threshold=', None, 'Percent slowdown to flag as a regression. Defaults to 10.'),
+    ]
+    metrics = ('compile', 'link', 'run', 'zlib')
+
+    def initialize_options(self):
+        self.start = None
+        self.stop = None
+        self.iterations = None
+        self.with_package_managers = None
+        self.output = None
+        self.baseline = None
+        self.update_baseline = None
+        self.threshold = None
+
+    def finalize_options(self):
+        parse_literal(self, 'iterations', None, int_type)
+        parse_literal(self, 'with_package_managers', None, bool_type)
+        parse_literal(self, 'update_baseline', None, bool_type)
+        parse_literal(self, 'threshold', None, number_type)
+        if self.iterations is None:
+            self.iterations = 3
+        if self.baseline is None:
+            self.baseline = benchmark_baseline
+        if self.threshold is None:
+            self.threshold = 10
+
+    def measure(self, docker, target):
+        '''Benchmark a single target, with all times in milliseconds.'''
+
+        # The zlib workload builds inside the test directory.
+        os.makedirs(f'{HOME}/build/benchmarks', exist_ok=True)
+        testdir = tempfile.mkdtemp(prefix=f'{target}-', dir=f'{HOME}/build/benchmarks')
+        ignore = shutil.ignore_patterns('buildtests', '__pycache__', '.pytest_cache')
+        shutil.copytree(f'{HOME}/test', testdir, ignore=ignore, dirs_exist_ok=True)
+
+        command = [
+            docker,
+            'run',
+            '--rm',
+            '-v', f'{testdir}:/test',
+            '--env', f'ITERATIONS={self.iterations}',
+            '--env', 'QUIET=1',
+        ]
+        if self.with_package_managers:
+            command += ['--env', 'ZLIB=1']
+        command += [
+            image_from_target(target, self.with_package_managers),
+            '/bin/bash', '/test/benchmark.sh',
+        ]
+        try:
+            with subprocess.Popen(command, stdout=subprocess.PIPE) as process:
+                stdout, _ = process.communicate()
+        finally:
+            shutil.rmtree(testdir, ignore_errors=True)
+        if process.returncode != 0:
+            return None
+
+        # Compile throughput is in source lines per second.
+        result = json.loads(stdout.decode('utf-8').splitlines()[-1])
+        lines = result.pop('lines')
+        result['compile_throughput'] = None
+        if result['compile']:
+            result['compile_throughput'] = 1000 * lines / result['compile']
+        return result
+
+    def compare(self, previous, current):
+        '''Get the relative change, in percent, of each workload time.'''
+
+        changes = {}
+        for metric in self.metrics:
+            old = previous.get(metric)
+            new = current.get(metric)
+            if old and new is not None:
+                changes[metric] = 100 * (new - old) / old
+        return changes
+
+    def run(self):
+        '''Benchmark all images, and compare them to the baseline.'''
+
+        docker = shutil.which('docker')
+        if not docker:
+            raise FileNotFoundError('Unable to find command docker.')
+
+        try:
+            with open(self.baseline) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            baseline = {}
+
+        results = {}
+        failures = []
+        regressions = []
+        print(f'{"target":<48}{"compile":>10}{"link":>10}{"run":>10}{"zlib":>10}')
+        for target in subslice_targets(self.start, self.stop):
+            # Not every target has a package manager image.
+            pkgimage = f'{HOME}/docker/pkgimages/Dockerfile.{target}'
+            if self.with_package_managers and not os.path.exists(pkgimage):
+                continue
+            result = self.measure(docker, target)
+            if result is None:
+                failures.append(target)
+                continue
+            results[target] = result
+            changes = {}
+            if target in baseline:
+                changes = self.compare(baseline[target], result)
+                result['changes'] = changes
+                if any(i > self.threshold for i in changes.values()):
+                    regressions.append(target)
+            columns = []
+            for metric in self.metrics:
+                value = result[metric]
+                change = changes.get(metric)
+                if value is None:
+                    columns.append('-')
+                elif change is None:
+                    columns.append(f'{value}')
+                else:
+                    columns.append(f'{change:+.0f}%')
+            print(f'{target:<48}{columns[0]:>10}{columns[1]:>10}{columns[2]:>10}{columns[3]:>10}')
+
+        if self.output is not None:
+            with open(self.output, 'w') as file:
+                json.dump(results, file, indent=4)
+        if self.update_baseline:
+            baseline.update({k: {i: v[i] for i in v if i != 'changes'} for k, v in results.items()})
+            with open(self.baseline, 'w') as file:
+                json.dump(baseline, file, indent=4, sort_keys=True)
+
+        # Print any failures and regressions.
+        if failures:
+            print('Error: Failures occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for failure in failures:
+                print(failure, file=sys.stderr)
+        if regressions:
+            print(f'Error: Regressions over {self.threshold}% occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for regression in regressions:
+                print(regression, file=sys.stderr)
+        if failures or regressions:
+            sys.exit(1)
+
+class ImageReportCommand(Command):
+    '''Compare the build time and size of the last two builds of each image.'''
+
+    description = 'report image build time and size regressions'
+    user_options = [
+        ('threshold=', None, 'Percent increase to flag as a regression. Defaults to 10.'),
+        ('output=', None, 'Path to write the JSON results to.'),
+        ('slim=', None, 'Report the toolchain sizes before and after slimming instead.'),
+    ]
+    metrics = ('duration', 'size', 'compressed_size')
+
+    def initialize_options(self):
+        self.threshold = None
+        self.output = None
+        self.slim = None
+
+    def finalize_options(self):
+        parse_literal(self, 'threshold', None, number_type)
+        parse_literal(self, 'slim', None, bool_type)
+        if self.threshold is None:
+            self.threshold = 10
+
+    def compare(self, previous, current):
+        '''Get the relative change, in percent, of each metric.'''
+
+        changes = {}
+        for metric in self.metrics:
+            old = previous.get(metric)
+            new = current.get(metric)
+            if old and new is not None:
+                changes[metric] = 100 * (new - old) / old
+        return changes
+
+    def report_slim(self, history):
+        '''Report the toolchain sizes before and after slimming, in MB.'''
+
+        results = {}
+        print(f'{"image":<56}{"before":>10}{"after":>10}{"saved":>10}')
+        for image in sorted(history):
+            slim = history[image][-1].get('slim')
+            if slim is None:
+                continue
+            results[image] = slim
+            before = slim['before'] / 1024**2
+            after = slim['after'] / 1024**2
+            saved = 100 * (1 - after / before) if before else 0
+            print(f'{image:<56}{before:>10.1f}{after:>10.1f}{saved:>9.1f}%')
+
+        if self.output is not None:
+            with open(self.output, 'w') as file:
+                json.dump(results, file, indent=4)
+
+    def run(self):
+        '''Report regressions between the last two builds of each image.'''
+
+        # Group the records by image, which are stored from oldest to newest.
+        history = {}
+        for record in load_image_history():
+            history.setdefault(record['image'], []).append(record)
+        if self.slim:
+            return self.report_slim(history)
+
+        results = {}
+        regressions = []
+        print(f'{"image":<56}{"time":>10}{"size":>10}{"pull":>10}')
+        for image in sorted(history):
+            records = history[image]
+            if len(records) < 2:
+                continue
+            changes = self.compare(records[-2], records[-1])
+            results[image] = changes
+            if any(i > self.threshold for i in changes.values()):
+                regressions.append(image)
+            columns = []
+            for metric in self.metrics:
+                change = changes.get(metric)
+                columns.append('-' if change is None else f'{change:+.1f}%')
+            print(f'{image:<56}{columns[0]:>10}{columns[1]:>10}{columns[2]:>10}')
+
+        if self.output is not None:
+            with open(self.output, 'w') as file:
+                json.dump(results, file, indent=4)
+
+        # Print any regressions.
+        if regressions:
+            print(f'Error: Regressions over {self.threshold}% occurred.', file=sys.stderr)
+            print('-------------------------', file=sys.stderr)
+            for regression in regressions:
+                print(regression, file=sys.stderr)
+            sys.exit(1)
+
 # IMAGES
 # ------
 
@@ -971,6 +2600,11 @@ class OperatingSystem(enum.Enum):
         '''Get the operating system from a triple string.'''
         return triple_os[string]
 
+    @staticmethod
+    def from_name(string):
+        '''Get the operating system from a case-insensitive name.'''
+        return os_names[string.lower()]
+
 cmake_string = {
     OperatingSystem.Android: 'Android',
     OperatingSystem.BareMetal: 'Generic',
@@ -1010,6 +2644,7 @@ vcpkg_string = {
     OperatingSystem.Windows: 'MinGW',
 }
 triple_os = {v: k for k, v in triple_string.items()}
+os_names = {i.name.lower(): i for i in OperatingSystem}
 
 oses = {
     'linux': OperatingSystem.Linux,
@@ -1055,20 +2690,57 @@ def extract_triple(triple):
         raise ValueError(f'Invalid LLVM triple, got {triple}')
     return (arch, vendor, os, system)
 
+# Prefixes of the triple system, and the C library they use.
+c_libraries = (
+    ('android', 'bionic'),
+    ('gnu', 'glibc'),
+    ('mingw', 'mingw'),
+    ('musl', 'musl'),
+    ('uclibc', 'uclibc'),
+)
+
 class Image:
     '''
     Parameters (and defaults) for custom images.
 
     * `target` - Image name of the target (resembling an LLVM triple).
     * `triple` - LLVM triple of the target. (arch, vendor, os, system)
+
+    Only the attributes in `__slots__` may be set, any optional
+    attributes that aren't provided use the property defaults.
     '''
 
+    __slots__ = (
+        'target',
+        'triple',
+        'arch',
+        'vendor',
+        'system',
+        'cpulist',
+        'library_path',
+        'preload',
+        'cc_cpulist',
+        'run_cpulist',
+        'package_dockerfile',
+        '_os',
+        '_config',
+        '_flags',
+        '_optional_flags',
+        '_processor',
+        '_family',
+        '_qemu',
+        '_linkage',
+    )
+
     def __init__(self, target, triple=None, **kwds):
         self.target = target
         self.triple = triple or target
         self.arch, self.vendor, self.os, self.system = extract_triple(self.triple)
         for key, value in kwds.items():
-            setattr(self, key, value)
+            try:
+                setattr(self, key, value)
+            except AttributeError:
+                raise ValueError(f'Invalid image attribute "{key}" for target {target}')
 
     @classmethod
     def from_dict(cls, data):
@@ -1178,6 +2850,11 @@ class Image:
     def family(self, value):
         self._family = value
 
+    @property
+    def aliases(self):
+        '''Images for other targets served by this image, with different flags.'''
+        return []
+
     @property
     def qemu(self):
         return getattr(self, '_qemu', False)
@@ -1194,9 +2871,19 @@ class Image:
     def linkage(self, value):
         self._linkage = value
 
+    @property
+    def c_library(self):
+        system = self.system or ''
+        for prefix, library in c_libraries:
+            if system.startswith(prefix):
+                return library
+        return None
+
 class AndroidImage(Image):
     '''Specialized properties for Android images.'''
 
+    __slots__ = ('_abi', '_prefix')
+
     @property
     def os(self):
         return OperatingSystem.Android
@@ -1232,6 +2919,8 @@ class AndroidImage(Image):
 class BuildRootImage(Image):
     '''Specialized properties for buildroot images.'''
 
+    __slots__ = ('_use_32', '_symlink_sysroot')
+
     @property
     def use_32(self):
         return getattr(self, '_use_32', False)
@@ -1251,6 +2940,8 @@ class BuildRootImage(Image):
 class CrosstoolImage(Image):
     '''Specialized properties for crosstool-NG images.'''
 
+    __slots__ = ('_patches',)
+
     @property
     def patches(self):
         return getattr(self, '_patches', [])
@@ -1262,6 +2953,8 @@ class CrosstoolImage(Image):
 class DebianImage(Image):
     '''Specialized properties for Debian images.'''
 
+    __slots__ = ('_cxx', '_libc', '_prefix')
+
     @property
     def cxx(self):
         default = f'g++-{{version}}-{self.processor}-{self.os.to_triple()}-{self.system}'
@@ -1295,6 +2988,8 @@ class DebianImage(Image):
 class MuslCrossImage(Image):
     '''Specialized properties for musl-cross images.'''
 
+    __slots__ = ('_gcc_config',)
+
     @property
     def gcc_config(self):
         config = getattr(self, '_gcc_config', '')
@@ -1309,6 +3004,16 @@ class MuslCrossImage(Image):
 class RiscvImage(Image):
     '''Specialized properties for RISC-V images.'''
 
+    __slots__ = ('extensions', 'abi', '_aliases')
+
+    @property
+    def aliases(self):
+        return [RiscvImage.from_dict(i) for i in getattr(self, '_aliases', [])]
+
+    @aliases.setter
+    def aliases(self, value):
+        self._aliases = value
+
     @property
     def processor(self):
         return self.target.split('-')[0]
@@ -1328,6 +3033,8 @@ class RiscvImage(Image):
 class OtherImage(Image):
     '''Specialized properties for miscellaneous images.'''
 
+    __slots__ = ('_dockerfile',)
+
     @property
     def dockerfile(self):
         return getattr(self, '_dockerfile', {})
@@ -1345,31 +3052,114 @@ image_types = {
     'riscv': RiscvImage,
     'other': OtherImage,
 }
+image_names = {v: k for k, v in image_types.items()}
+
+class ImageRegistry:
+    '''
+    Indexed collection of all images.
+
+    Images are indexed by type, OS, arch, libc and qemu support,
+    and can be queried with `select`, for example,
+    `registry.select(os='linux', qemu=True)`. Each criterion
+    may either be a single value or a collection of values.
+    '''
 
-# Get all images.
-images = [Image.from_json(i) for i in load_json(f'{HOME}/config/images.json')]
+    def __init__(self, images):
+        self.images = images
+        self.targets = {i.target: i for i in images}
+        self.indexes = {
+            'type': {},
+            'os': {},
+            'arch': {},
+            'libc': {},
+            'qemu': {},
+        }
+        for image in images:
+            values = {
+                'type': image_names[type(image)],
+                'os': image.os,
+                'arch': image.arch,
+                'libc': image.c_library,
+                'qemu': image.qemu,
+            }
+            for key, value in values.items():
+                self.indexes[key].setdefault(value, set()).add(image.target)
+
+        # Order OS images first, then bare-metal images, then all others.
+        def sort_key(image):
+            if image.os.is_os():
+                return (0, image.target)
+            elif image.os.is_baremetal():
+                return (1, image.target)
+            return (2, image.target)
+        self.sorted_targets = [i.target for i in sorted(images, key=sort_key)]
+        self.positions = {j: i for i, j in enumerate(self.sorted_targets)}
+
+    def __iter__(self):
+        return iter(self.images)
+
+    def __len__(self):
+        return len(self.images)
+
+    def __getitem__(self, target):
+        return self.targets[target]
+
+    def select(self, **criteria):
+        '''Select all images matching every criterion, in definition order.'''
+
+        matches = None
+        for key, values in criteria.items():
+            if key not in self.indexes:
+                raise ValueError(f'Invalid image criterion "{key}"')
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = [values]
+            found = set()
+            for value in values:
+                if key == 'os' and isinstance(value, str):
+                    value = OperatingSystem.from_name(value)
+                found |= self.indexes[key].get(value, set())
+            matches = found if matches is None else matches & found
+
+        if matches is None:
+            return list(self.images)
+        return [i for i in self.images if i.target in matches]
+
+    def subslice(self, start=None, stop=None):
+        '''Get the sorted targets, from start to stop, inclusive.'''
+
+        for target in (start, stop):
+            if target is not None and target not in self.positions:
+                raise ValueError(f'Unknown target {target}')
+        first = 0
+        last = len(self.sorted_targets)
+        if start is not None:
+            first = self.positions[start]
+        if stop is not None:
+            last = self.positions[stop] + 1
+        return self.sorted_targets[first:last]
 
 # Add extensions
-def add_android_extensions():
+def add_android_extensions(images):
     '''Add Android extensions (null-op).'''
 
-def add_buildroot_extensions():
+def add_buildroot_extensions(images):
     '''Add buildroot extensions (null-op).'''
 
-def add_crosstool_extensions():
+def add_crosstool_extensions(images):
     '''Add crosstool-NG toolchain extensions (null-op).'''
 
-def add_debian_extensions():
+def add_debian_extensions(images):
     '''Add Debian toolchain extensions (null-op).'''
 
-def add_musl_cross_extensions():
+def add_musl_cross_extensions(images):
     '''Add musl-cross toolchain extensions (null-op).'''
 
 # Add our RISC-V images with extensions.
-def create_riscv_image(os, bits, arch, abi):
-    '''Create a RISC-V image.'''
+def create_riscv_image(os, bits, arch, abi, prefix=None):
+    '''Create the data for a RISC-V image.'''
 
-    prefix = f'riscv{bits}-{arch}-{abi}'
+    if prefix is None:
+        prefix = f'riscv{bits}-{arch}-{abi}'
     if os == OperatingSystem.Linux:
         target = f'{prefix}-multilib-linux-gnu'
         triple = 'riscv64-unknown-linux-gnu'
@@ -1381,15 +3171,27 @@ def create_riscv_image(os, bits, arch, abi):
     else:
         raise ValueError(f'Unknown operating system {os.to_triple()}')
 
-    return RiscvImage.from_dict({
+    return {
+        'type': 'riscv',
         'target': target,
         'triple': triple,
         'qemu': qemu,
         'extensions': arch,
         'abi': abi
-    })
+    }
 
-def add_riscv_extensions():
+def add_riscv_aliases(images, os, bits, variants):
+    '''Add the RISC-V variants as aliases to the multilib image.'''
+
+    # The toolchains are already multilib, so every variant only
+    # differs by flags, and can share the multilib image.
+    target = create_riscv_image(os, bits, None, None, f'riscv{bits}')['target']
+    image = next((i for i in images if i['target'] == target), None)
+    if image is None:
+        raise ValueError(f'Missing multilib RISC-V image {target}')
+    image['aliases'] = [{k: v for k, v in i.items() if k != 'type'} for i in variants]
+
+def add_riscv_extensions(images):
     '''Add RISC-V extensions.'''
 
     riscv = config['riscv-gnu-toolchain']
@@ -1402,33 +3204,71 @@ def add_riscv_extensions():
         diff = ''.join([i for i in all_ext if i not in required_ext])
         for bits in riscv['bits']:
             abi = riscv['abi'][bits]
+            variants = []
             for count in range(len(diff) + 1):
                 for combo in itertools.combinations(diff, count):
                     arch = f'{required_ext}{"".join(combo)}'
-                    images.append(create_riscv_image(os, bits, arch, abi))
+                    variants.append(create_riscv_image(os, bits, arch, abi))
                     if 'd' in arch:
-                        images.append(create_riscv_image(os, bits, arch, f'{abi}d'))
+                        variants.append(create_riscv_image(os, bits, arch, f'{abi}d'))
+            if riscv['multilib']:
+                add_riscv_aliases(images, os, bits, variants)
+            else:
+                images += variants
 
-def add_extensions():
+def add_extensions(images):
     '''Add extensions for supported operating systems.'''
 
-    add_android_extensions()
-    add_buildroot_extensions()
-    add_crosstool_extensions()
-    add_debian_extensions()
-    add_musl_cross_extensions()
-    add_riscv_extensions()
+    add_android_extensions(images)
+    add_buildroot_extensions(images)
+    add_crosstool_extensions(images)
+    add_debian_extensions(images)
+    add_musl_cross_extensions(images)
+    add_riscv_extensions(images)
+
+# Serialized image data, including all extensions, which is
+# invalidated if the config files or this script change.
+images_cache = f'{HOME}/.images-cache.json'
+
+def images_cache_key():
+    '''Calculate the key for the serialized image data.'''
+
+    hasher = hashlib.sha256()
+    paths = [
+        f'{HOME}/config/config.json',
+        f'{HOME}/config/images.json',
+        os.path.realpath(__file__),
+    ]
+    for path in paths:
+        with open(path, 'rb') as file:
+            hasher.update(hashlib.sha256(file.read()).digest())
+    return hasher.hexdigest()
+
+def load_image_data():
+    '''Load the data for all images, from the cache if it's still valid.'''
+
+    key = images_cache_key()
+    try:
+        with open(images_cache, 'r') as file:
+            cache = json.load(file)
+        if cache['key'] == key:
+            return cache['images']
+    except (FileNotFoundError, KeyError, TypeError, ValueError):
+        pass
 
-add_extensions()
+    images = load_json(f'{HOME}/config/images.json')
+    add_extensions(images)
+    try:
+        with open(images_cache, 'w') as file:
+            json.dump({'key': key, 'images': images}, file)
+    except OSError:
+        pass
+    return images
 
-# Filter images by types.
-android_images = [i for i in images if isinstance(i, AndroidImage)]
-buildroot_images = [i for i in images if isinstance(i, BuildRootImage)]
-crosstool_images = [i for i in images if isinstance(i, CrosstoolImage)]
-debian_images = [i for i in images if isinstance(i, DebianImage)]
-musl_cross_images = [i for i in images if isinstance(i, MuslCrossImage)]
-riscv_images = [i for i in images if isinstance(i, RiscvImage)]
-other_images = [i for i in images if isinstance(i, OtherImage)]
+@functools.lru_cache(maxsize=None)
+def get_registry():
+    '''Get the indexed registry of all images.'''
+    return ImageRegistry([Image.from_json(i) for i in load_image_data()])
 
 def create_array(values):
     '''Create a bash array from a list of values.'''
@@ -1452,23 +3292,26 @@ class ConfigureCommand(VersionCommand):
         buildroot32 = f'{HOME}/docker/buildroot32.sh'
         cmake = f'{HOME}/docker/cmake.sh'
         conan = f'{HOME}/docker/conan.sh'
+        crosstool_ng = f'{HOME}/docker/crosstool-ng.sh'
         entrypoint = f'{HOME}/docker/entrypoint.sh'
         gcc = f'{HOME}/docker/gcc.sh'
         gcc_patch = f'{HOME}/docker/gcc-patch.sh'
         meson = f'{HOME}/docker/meson.sh'
         musl = f'{HOME}/docker/musl.sh'
         qemu = f'{HOME}/docker/qemu.sh'
-        qemu_apt = f'{HOME}/docker/qemu-apt.sh'
         riscv_gcc = f'{HOME}/docker/riscv-gcc.sh'
         shortcut = f'{HOME}/symlink/shortcut.sh'
         target_features = f'{HOME}/spec/target_features.py'
         vcpkg = f'{HOME}/docker/vcpkg.sh'
         vcpkg_triplet = f'{HOME}/docker/vcpkg-triplet.sh'
+        android_images = get_registry().select(type='android')
         self.configure(f'{android}.in', android, True, [
             ('CLANG_VERSION', config['android']['clang_version']),
+            ('MIN_SDK_VERSION', config['android']['min_sdk_version']),
             ('NDK_DIRECTORY', config['android']['ndk_directory']),
             ('NDK_VERSION', config['android']['ndk_version']),
             ('PREFIXES', create_array([i.prefix for i in android_images])),
+            ('SDK_VERSION', config['android']['sdk_version']),
             ('TOOLCHAINS', create_array([i.toolchain for i in android_images]))
         ])
         self.configure(f'{bashrc}.in', bashrc, False, [
@@ -1482,6 +3325,11 @@ class ConfigureCommand(VersionCommand):
             ('CONAN', "'/usr/local/bin/conan'"),
             ('USERNAME', config["options"]["username"]),
         ])
+        self.configure(f'{crosstool_ng}.in', crosstool_ng, True, [
+            ('CROSSTOOL_PREFIX', crosstool_prefix),
+            ('CROSSTOOL_VERSION', f'"{ct_version}"'),
+            ('JOBS', config["options"]["build_jobs"]),
+        ])
         self.configure(f'{buildroot}.in', buildroot, True, [
             ('BUILDROOT_VERSION', buildroot_version),
             ('JOBS', config["options"]["build_jobs"]),
@@ -1496,14 +3344,14 @@ class ConfigureCommand(VersionCommand):
             ('BIN', f'"{bin_directory}"'),
         ])
         self.configure(f'{gcc}.in', gcc, True, [
-            ('CROSSTOOL_VERSION', f'"{ct_version}"'),
+            ('CROSSTOOL_PREFIX', crosstool_prefix),
             ('JOBS', config["options"]["build_jobs"]),
             ('SLEEP', config["options"]["sleep"]),
             ('TIMEOUT', config["options"]["timeout"]),
             ('USERNAME', config["options"]["username"]),
         ])
         self.configure(f'{gcc_patch}.in', gcc_patch, True, [
-            ('CROSSTOOL_VERSION', f'"{ct_version}"'),
+            ('CROSSTOOL_PREFIX', crosstool_prefix),
             ('JOBS', config["options"]["build_jobs"]),
             ('SLEEP', config["options"]["sleep"]),
             ('TIMEOUT', config["options"]["timeout"]),
@@ -1538,11 +3386,8 @@ class ConfigureCommand(VersionCommand):
         ])
         self.configure(f'{qemu}.in', qemu, True, [
             ('JOBS', config["options"]["build_jobs"]),
+            ('QEMU_PREFIX', qemu_prefix),
             ('QEMU_VERSION', qemu_version),
-            ('SYSROOT', f'"{config["options"]["sysroot"]}"'),
-        ])
-        self.configure(f'{qemu_apt}.in', qemu_apt, True, [
-            ('BIN', f'"{bin_directory}"'),
         ])
         self.configure(f'{riscv_gcc}.in', riscv_gcc, True, [
             ('BINUTILS_VERSION', riscv_binutils_version),
@@ -1648,7 +3493,7 @@ class ConfigureCommand(VersionCommand):
         '''Configure the MUSL libc config files.'''
 
         template = f'{HOME}/musl/config.mak.in'
-        for image in musl_cross_images:
+        for image in get_registry().select(type='musl-cross'):
             outfile = f'{HOME}/musl/config/{image.target}.mak'
             self.configure(template, outfile, False, [
                 ('BINUTILS_VERSION', binutils_version),
@@ -1670,7 +3515,8 @@ class ConfigureCommand(VersionCommand):
         image,
         template=None,
         replacements=None,
-        base='ubuntu',
+        base='base',
+        staged=False,
         spec='spec',
         symlink='symlink',
         toolchain='toolchain',
@@ -1679,67 +3525,59 @@ class ConfigureCommand(VersionCommand):
         cc='',
         cxx='',
     ):
-        '''Configure a Dockerfile from template.'''
+        '''
+        Configure a Dockerfile from template.
+
+        If `staged`, the template builds the toolchain in a separate
+        stage, and then starts the final image from the base image.
+        '''
 
         # These files are read in the order they're likely to change,
         # as well as compile-time.
         #   Any template files may have long compilations, and will
-        #   change rarely. Qemu is an apt package, and unlikely to change.
+        #   change rarely. Qemu is copied from a shared image, and
+        #   unlikely to change.
         #   Symlinks, toolchains, and entrypoints change often, but are
         #   cheap and easy to fix.
-        contents = []
-
-        # Mandatory Docker templates, the base image.
-        # These will **never** change,
-        with open(f'{HOME}/docker/Dockerfile.{base}.in', 'r') as file:
-            contents.append(file.read())
-        with open(f'{HOME}/docker/Dockerfile.adduser.in', 'r') as file:
-            contents.append(file.read())
-        with open(f'{HOME}/docker/Dockerfile.build-essential.in', 'r') as file:
-            contents.append(file.read())
-        with open(f'{HOME}/docker/Dockerfile.directory.in', 'r') as file:
-            contents.append(file.read())
+        templates = [f'{HOME}/docker/Dockerfile.syntax.in']
 
         # Optional docker templates, in order of compiler time.
         # These will change, but it's important later templates
         # build faster than earlier templates. If done incorrectly,
         # a full rebuild can take well over a week.
+        # The shared base image will **never** change.
+        if not staged:
+            templates.append(f'{HOME}/docker/Dockerfile.from.in')
         if template is not None:
-            with open(template, 'r') as file:
-                contents.append(file.read())
+            templates.append(template)
         if image.qemu:
-            with open(f'{HOME}/docker/Dockerfile.qemu.in', 'r') as file:
-                contents.append(file.read())
+            templates.append(f'{HOME}/docker/Dockerfile.qemu.in')
         if wrapper is not None:
-            with open(f'{HOME}/docker/Dockerfile.{wrapper}.in', 'r') as file:
-                contents.append(file.read())
+            templates.append(f'{HOME}/docker/Dockerfile.{wrapper}.in')
         if symlink is not None:
-            with open(f'{HOME}/docker/Dockerfile.{symlink}.in', 'r') as file:
-                contents.append(file.read())
+            templates.append(f'{HOME}/docker/Dockerfile.{symlink}.in')
         if spec is not None:
-            with open(f'{HOME}/docker/Dockerfile.{spec}.in', 'r') as file:
-                contents.append(file.read())
+            templates.append(f'{HOME}/docker/Dockerfile.{spec}.in')
         if toolchain is not None:
-            with open(f'{HOME}/docker/Dockerfile.{toolchain}.in', 'r') as file:
-                contents.append(file.read())
+            templates.append(f'{HOME}/docker/Dockerfile.{toolchain}.in')
 
         # Add the mandatory entrypoint.
-        with open(f'{HOME}/docker/Dockerfile.entrypoint.in', 'r') as file:
-            contents.append(file.read())
+        templates.append(f'{HOME}/docker/Dockerfile.entrypoint.in')
 
         # Add image labels and metadata.
-        with open(f'{HOME}/docker/Dockerfile.metadata.in', 'r') as file:
-            contents.append(file.read())
-        contents = '\n'.join(contents)
+        templates.append(f'{HOME}/docker/Dockerfile.metadata.in')
 
         # Add to the replacements all the shared values.
         if replacements is None:
             replacements = []
         replacements = replacements + [
             ('AUTHORS', config['metadata']['authors']),
+            ('BASE_IMAGE', image_from_target(base)),
             ('EMSDK_VERSION', emsdk_version),
             ('BIN', f'"{bin_directory}"'),
             ('CC', f'"{cc}"'),
+            ('CROSSTOOL_IMAGE', image_from_target('crosstool-ng')),
+            ('CROSSTOOL_PREFIX', crosstool_prefix),
             ('CXX', f'"{cxx}"'),
             ('ENTRYPOINT', f'"{bin_directory}/entrypoint.sh"'),
             ('FLAGS', f'"{image.flags}"'),
@@ -1747,6 +3585,8 @@ class ConfigureCommand(VersionCommand):
             ('MAINTAINER', config['metadata']['maintainer']),
             ('OPTIONAL_FLAGS', f'"{image.optional_flags}"'),
             ('OS', image.os.to_triple() or 'unknown'),
+            ('QEMU_IMAGE', image_from_target('qemu')),
+            ('QEMU_PREFIX', qemu_prefix),
             ('TARGET', image.target),
             ('UBUNTU_VERSION', ubuntu_version),
             ('URL', config['metadata']['url']),
@@ -1756,27 +3596,71 @@ class ConfigureCommand(VersionCommand):
 
         # Replace the contents and write the output to file.
         outfile = f'{HOME}/docker/images/Dockerfile.{image.target}'
-        contents = self.replace(contents, replacements)
-        self.write_file(outfile, contents, False)
+        self.configure_files(templates, outfile, False, replacements)
+
+    def configure_base_dockerfile(self):
+        '''Configure the base Dockerfile shared by all images.'''
+
+        # Mandatory Docker templates, the base image.
+        # These will **never** change,
+        templates = [
+            f'{HOME}/docker/Dockerfile.syntax.in',
+            f'{HOME}/docker/Dockerfile.ubuntu.in',
+            f'{HOME}/docker/Dockerfile.dpkg.in',
+            f'{HOME}/docker/Dockerfile.apt.in',
+            f'{HOME}/docker/Dockerfile.adduser.in',
+            f'{HOME}/docker/Dockerfile.build-essential.in',
+            f'{HOME}/docker/Dockerfile.directory.in',
+        ]
+
+        # Replace the contents and write the output to file.
+        replacements = [
+            ('APT_SNAPSHOT', config['options']['apt_snapshot']),
+            ('BIN', f'"{bin_directory}"'),
+            ('UBUNTU_VERSION', ubuntu_version),
+            ('USERNAME', config['options']['username']),
+        ]
+        outfile = f'{HOME}/docker/images/Dockerfile.base'
+        self.configure_files(templates, outfile, False, replacements)
+
+    def configure_builder_dockerfiles(self):
+        '''Configure the Dockerfiles for the shared builder images.'''
+
+        # These are built once, and other images copy from them.
+        # Qemu is built for every target any image emulates.
+        registry = get_registry()
+        targets = sorted({f'{i.processor}-linux-user' for i in registry.select(qemu=True)})
+        replacements = [
+            ('BASE_IMAGE', image_from_target('base')),
+            ('TARGETS', ','.join(targets)),
+        ]
+        for builder, template in (('crosstool-ng', 'crosstool-ng'), ('qemu', 'qemu-user')):
+            templates = [
+                f'{HOME}/docker/Dockerfile.syntax.in',
+                f'{HOME}/docker/Dockerfile.from.in',
+                f'{HOME}/docker/Dockerfile.{template}.in',
+            ]
+            outfile = f'{HOME}/docker/images/Dockerfile.{builder}'
+            self.configure_files(templates, outfile, False, replacements)
 
     def configure_vcpkg_dockerfile(self, base='ubuntu'):
         '''Configure only the vcpkg Dockefile.'''
 
         # This is a base image shared by multiple builds.
-        contents = []
-        with open(f'{HOME}/docker/Dockerfile.{base}.in', 'r') as file:
-            contents.append(file.read())
-        with open(f'{HOME}/docker/Dockerfile.vcpkg.in', 'r') as file:
-            contents.append(file.read())
-        contents = '\n'.join(contents)
+        templates = [
+            f'{HOME}/docker/Dockerfile.syntax.in',
+            f'{HOME}/docker/Dockerfile.{base}.in',
+            f'{HOME}/docker/Dockerfile.apt.in',
+            f'{HOME}/docker/Dockerfile.vcpkg.in',
+        ]
 
         # Replace the contents and write the output to file.
         replacements = [
+            ('APT_SNAPSHOT', config['options']['apt_snapshot']),
             ('UBUNTU_VERSION', ubuntu_version),
         ]
         outfile = f'{HOME}/docker/pkgimages/Dockerfile.vcpkg'
-        contents = self.replace(contents, replacements)
-        self.write_file(outfile, contents, False)
+        self.configure_files(templates, outfile, False, replacements)
 
     def configure_package_dockerfile(
         self,
@@ -1799,9 +3683,12 @@ class ConfigureCommand(VersionCommand):
             meson_system = image.os.to_meson()
         if vcpkg_system is None:
             vcpkg_system = image.os.to_vcpkg()
-        template = f'{HOME}/docker/Dockerfile.package.in'
+        templates = [
+            f'{HOME}/docker/Dockerfile.syntax.in',
+            f'{HOME}/docker/Dockerfile.package.in',
+        ]
         outfile = f'{HOME}/docker/pkgimages/Dockerfile.{image.target}'
-        self.configure(template, outfile, False, [
+        self.configure_files(templates, outfile, False, [
             ('COMPILER', compiler),
             ('COMPILER_VERSION', f'"{compiler_version}"'),
             ('CONAN_SYSTEM', conan_system),
@@ -1826,17 +3713,14 @@ class ConfigureCommand(VersionCommand):
             ('OS', image.os.to_cmake()),
             ('USERNAME', config["options"]["username"]),
         ]
-        contents = []
-        with open(template, 'r') as file:
-            contents.append(file.read())
-        with open(f'{HOME}/cmake/toolchain-include.cmake.in', 'r') as file:
-            contents.append(file.read())
-        contents = '\n'.join(contents)
+        templates = [
+            template,
+            f'{HOME}/cmake/toolchain-include.cmake.in',
+        ]
 
         # Replace the contents and write the output to file.
         cmake = f'{HOME}/cmake/toolchain/{image.target}.cmake'
-        contents = self.replace(contents, replacements)
-        self.write_file(cmake, contents, False)
+        self.configure_files(templates, cmake, False, replacements)
 
     def configure_symlinks(self, image, template, replacements):
         '''Configure a symlink template.'''
@@ -1861,9 +3745,13 @@ class ConfigureCommand(VersionCommand):
         # Configure the dockerfile.
         template = f'{HOME}/docker/Dockerfile.android.in'
         self.configure_dockerfile(image, template, [
+            ('ABI', image.abi),
             ('ARCH', image.arch),
+            ('MIN_SDK_VERSION', config['android']['min_sdk_version']),
+            ('NDK_DIRECTORY', config['android']['ndk_directory']),
+            ('SDK_VERSION', config['android']['sdk_version']),
             ('TOOLCHAIN', image.toolchain),
-        ])
+        ], staged=True)
 
         # Configure the CMake toolchain.
         cmake_template = f'{HOME}/cmake/android.cmake.in'
@@ -1909,7 +3797,7 @@ class ConfigureCommand(VersionCommand):
         self.configure_dockerfile(image, template, [
             ('ARCH', image.processor),
             ('CONFIG', image.config),
-        ])
+        ], staged=True)
 
         # Configure the CMake toolchain.
         self.configure_cmake(image, cmake_template, [
@@ -1944,7 +3832,7 @@ class ConfigureCommand(VersionCommand):
             ('ARCH', image.processor),
             ('CONFIG', image.config),
             ('PATCH', patches),
-        ])
+        ], staged=True)
 
         # Get the proper dependent parameters for our image.
         if image.os == OperatingSystem.BareMetal:
@@ -2025,7 +3913,7 @@ class ConfigureCommand(VersionCommand):
         self.configure_dockerfile(image, template, [
             ('ARCH', image.processor),
             ('TRIPLE', image.config),
-        ])
+        ], staged=True)
 
         # Configure the CMake toolchain.
         self.configure_cmake(image, cmake_template, [
@@ -2056,21 +3944,38 @@ class ConfigureCommand(VersionCommand):
         else:
             symlink_template = f'{HOME}/symlink/riscv.sh.in'
 
-        # Configure the dockerfile.
+        # Configure the dockerfile. Multilib images add the symlinks
+        # for each alias into a separate directory, which is added
+        # to the path by sourcing `/env/targets/<alias>`.
         template = f'{HOME}/docker/Dockerfile.riscv.in'
+        symlink = 'symlink'
+        aliases = []
+        for alias in image.aliases:
+            directory = f'{config["options"]["sysroot"]}/targets/{alias.target}/bin'
+            aliases += [
+                f'COPY ["symlink/toolchain/{alias.target}.sh", "/"]',
+                f'RUN mkdir -p {directory} /env/targets \\',
+                f'    && echo \'export PATH="{directory}:$PATH"\' > /env/targets/{alias.target} \\',
+                f'    && BIN={directory} "/{alias.target}.sh" \\',
+                f'    && rm "/{alias.target}.sh"',
+            ]
+        if aliases:
+            symlink = 'symlink-aliases'
         self.configure_dockerfile(image, template, [
+            ('ALIASES', '\n'.join(aliases)),
             ('ARCH', image.processor),
             ('TRIPLE', image.triple),
-        ])
+        ], staged=True, symlink=symlink)
 
         # Configure the CMake toolchain.
         self.configure_cmake(image, cmake_template, [])
 
         # Configure the symlinks.
-        self.configure_symlinks(image, symlink_template, [
-            ('ARCH', image.processor),
-            ('TRIPLE', image.triple),
-        ])
+        for i in [image] + image.aliases:
+            self.configure_symlinks(i, symlink_template, [
+                ('ARCH', i.processor),
+                ('TRIPLE', i.triple),
+            ])
 
         # Build derived images with package managers enabled.
         if image.os == OperatingSystem.Linux:
@@ -2103,7 +4008,7 @@ class ConfigureCommand(VersionCommand):
     def run(self):
         '''Modify configuration files.'''
 
-        VersionCommand.run(self)
+        self.configure_version()
 
         # Make the required subdirectories.
         os.makedirs(f'{HOME}/cmake/toolchain', exist_ok=True)
@@ -2132,22 +4037,28 @@ class ConfigureCommand(VersionCommand):
         self.configure_musl_config()
 
         # Configure images.
+        registry = get_registry()
+        self.configure_base_dockerfile()
+        self.configure_builder_dockerfiles()
         self.configure_vcpkg_dockerfile()
-        for image in android_images:
+        for image in registry.select(type='android'):
             self.configure_android(image)
-        for image in buildroot_images:
+        for image in registry.select(type='buildroot'):
             self.configure_buildroot(image)
-        for image in crosstool_images:
+        for image in registry.select(type='crosstool'):
             self.configure_crosstool(image)
-        for image in debian_images:
+        for image in registry.select(type='debian'):
             self.configure_debian(image)
-        for image in musl_cross_images:
+        for image in registry.select(type='musl-cross'):
             self.configure_musl(image)
-        for image in riscv_images:
+        for image in registry.select(type='riscv'):
             self.configure_riscv(image)
-        for image in other_images:
+        for image in registry.select(type='other'):
             self.configure_other(image)
 
+        # Only regenerate the files with changed inputs.
+        self.generate()
+
 script = f'{HOME}/bin/xcross'
 if len(sys.argv) >= 2 and sys.argv[1] == 'py2exe':
     params = {
@@ -2206,6 +4117,7 @@ setuptools.setup(
         'Topic :: Software Development :: Embedded Systems',
     ],
     cmdclass={
+        'benchmark': BenchmarkCommand,
         'build_all': BuildAllCommand,
         'build_image': BuildImageCommand,
         'build_images': BuildImagesCommand,
@@ -2213,10 +4125,13 @@ setuptools.setup(
         'clean': CleanCommand,
         'clean_dist': CleanDistCommand,
         'configure': ConfigureCommand,
+        'fetch_sources': FetchSourcesCommand,
+        'image_report': ImageReportCommand,
         'install': InstallCommand,
         'lint': LintCommand,
         'publish': PublishCommand,
         'push': PushCommand,
+        'shell_startup': ShellStartupCommand,
         'tag': TagCommand,
         'test_images': TestImagesCommand,
         'test': TestCommand,
@@ -0,0 +1,744 @@
+#!/user/bin/env python
+'''
+    target_features
+    ---------------
+
+    Detect target features for a given architecture.
+
+    Each probe runs in an isolated temporary directory, so the
+    probes may be run concurrently. The results are memoized on
+    disk, keyed by the toolchain and flags, so rebuilding the
+    image or re-probing with different flags is fast.
+'''
+
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import struct
+import subprocess
+import tempfile
+
+bin_dir = "/opt/bin/"
+# Directory to memoize probe results to. This should be a
+# cache mount, so results persist between image builds.
+cache_dir = os.environ.get('PROBE_CACHE', '/var/cache/xcross/target-features')
+
+def find_executable(executable):
+    '''Find if an executable is available.'''
+
+    devnull = subprocess.DEVNULL
+    if executable.startswith('/') and os.path.exists(executable):
+        return True
+    elif subprocess.call(
+        ['which', executable],
+        stderr=devnull,
+        stdout=devnull,
+    ) == 0:
+        return True
+    return False
+
+def find_first_executable(executables, name):
+    '''Find the first executable that is available.'''
+
+    for executable in executables:
+        if find_executable(executable):
+            return executable
+    raise ValueError(f'Unable to find {name}.')
+
+def find_linker():
+    '''Get the executable for the linker.'''
+
+    env_linker = os.environ.get('LINKER')
+    if env_linker and find_executable(env_linker):
+        return env_linker
+    linkers = ['ld', 'ld.bfd', 'ld.gold']
+    linkers += [f'{bin_dir}/{i}' for i in linkers]
+    return find_first_executable(linkers, 'linker')
+
+def find_cc():
+    '''Find the C compiler.'''
+
+    env_cc = os.environ.get('CC')
+    if env_cc and find_executable(env_cc):
+        return env_cc
+    compilers = ['cc', 'gcc', 'clang']
+    compilers += [f'{bin_dir}/{i}' for i in compilers]
+    return find_first_executable(compilers, 'cc')
+
+def find_cxx():
+    '''Find the C++ compiler.'''
+
+    env_cxx = os.environ.get('CXX')
+    if env_cxx and find_executable(env_cxx):
+        return env_cxx
+    compilers = ['c++', 'g++', 'clang++']
+    compilers += [f'{bin_dir}/{i}' for i in compilers]
+    return find_first_executable(compilers, 'c++')
+
+def linker_is_gnu(workdir, linker):
+    '''Determine if the linker flavor is GNU.'''
+
+    with subprocess.Popen(
+        [linker, '--version'],
+        cwd=workdir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    ) as process:
+        code = process.wait()
+        if code == 0:
+            stdout = process.stdout.read().decode('utf-8')
+            if 'GNU' in stdout:
+                return True
+            else:
+                return False
+    raise ValueError('Unable to call version to linker.')
+
+def parse_defines(cc):
+    '''Dump and parse the GCC compiler defines.'''
+
+    with subprocess.Popen(
+        f'{cc} -dM -E - < /dev/null',
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    ) as process:
+        code = process.wait()
+        assert code == 0
+        stdout = process.stdout.read().decode('utf-8')
+
+    lines = stdout.splitlines()
+    regex = re.compile(r'^#define (\S+) ?(.*)$')
+    data = [regex.match(i).groups() for i in lines]
+    return {k: v for k, v in data}
+
+def eh_frame_header(workdir, linker, cxx):
+    '''Determine if the linker supports --eh-frame-hdr.'''
+
+    # Doesn't need `-nostartfiles`, since by default we
+    # don't provide crt0.
+    devnull = subprocess.DEVNULL
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('int main() { return 0; }')
+    subprocess.check_call(
+        [cxx, '-c', 'main.cc', '-o', 'main.o'],
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    code = subprocess.call(
+        [linker, 'main.o', '-o', 'main', '--eh-frame-hdr'],
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    return code == 0
+
+def alignof(workdir, c_type, cc):
+    '''Calculate the alignment of a given type.'''
+
+    # We use the hack to get the alignment:
+    #   char (*alignment)[alignof({type})] = 1;
+    with open(f'{workdir}/main.c', 'w') as file:
+        # Note: `size_t` is not guaranteed to be in `stdint`.
+        #   Use `stddef` to guarantee it's there.
+        file.write('#include <stdalign.h>\n')
+        file.write('#include <stddef.h>\n')
+        file.write('#include <stdint.h>\n')
+        # Note: alignof is C++11, _Alignof is C11.
+        #   alignof in C is a GNU extension.
+        file.write(f'char (*alignment)[_Alignof({c_type})] = 1.0;\n')
+        file.write('int main() { return 0; }\n')
+
+    with subprocess.Popen(
+        [cc, 'main.c', '-o', 'main', '-std=c11'],
+        cwd=workdir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    ) as process:
+        stdout = process.stdout.read().decode('utf-8')
+
+    # Match the type size.
+    capture = r'\[(\d+)\]'
+    quote = r'[\'‘’]'
+    floats = r'(?:double|float|long double)'
+    regexes = [
+        re.compile(fr'{capture}{quote} with an expression of type'),
+        re.compile(fr'{capture}{quote} with an expression of incompatible type'),
+        re.compile(fr'{capture}{quote} from {quote}{floats}{quote} makes pointer'),
+        re.compile(fr'{capture}{quote} using type {quote}{floats}{quote}'),
+    ]
+    for regex in regexes:
+        match = regex.search(stdout)
+        if match is not None:
+            return match.group(1)
+
+    raise ValueError(stdout)
+
+def elf_symbol_sizes(path):
+    '''Read the size of every symbol in an ELF object file.'''
+
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:4] != b'\x7fELF':
+        raise ValueError(f'{path} is not an ELF file.')
+
+    # Only need the section headers and the symbol tables.
+    # The layouts differ between ELF32 and ELF64.
+    is_64 = data[4] == 2
+    endian = '<' if data[5] == 1 else '>'
+    if is_64:
+        shoff = struct.unpack_from(f'{endian}Q', data, 0x28)[0]
+        shentsize, shnum = struct.unpack_from(f'{endian}HH', data, 0x3A)
+        section_format = f'{endian}IIQQQQIIQQ'
+    else:
+        shoff = struct.unpack_from(f'{endian}I', data, 0x20)[0]
+        shentsize, shnum = struct.unpack_from(f'{endian}HH', data, 0x2E)
+        section_format = f'{endian}IIIIIIIIII'
+    sections = []
+    for index in range(shnum):
+        header = struct.unpack_from(section_format, data, shoff + index * shentsize)
+        # (type, offset, size, link, entsize)
+        sections.append((header[1], header[4], header[5], header[6], header[9]))
+
+    sizes = {}
+    sht_symtab = 2
+    for section_type, offset, size, link, entsize in sections:
+        if section_type != sht_symtab:
+            continue
+        strtab = sections[link][1]
+        for index in range(size // entsize):
+            start = offset + index * entsize
+            if is_64:
+                name, _, _, _, _, st_size = struct.unpack_from(f'{endian}IBBHQQ', data, start)
+            else:
+                name, _, st_size, _, _, _ = struct.unpack_from(f'{endian}IIIBBH', data, start)
+            end = data.index(b'\0', strtab + name)
+            sizes[data[strtab + name:end].decode('utf-8')] = st_size
+    return sizes
+
+def abi_layout(workdir, types, cc, prefix=''):
+    '''Calculate the size, alignment and signedness of many types at once.'''
+
+    # Encode each value as the size of an array, and then read the
+    # sizes back from the symbol table of the object file. This only
+    # requires a single compilation, regardless of the number of types.
+    with open(f'{workdir}/layout.c', 'w') as file:
+        # Note: `stddef` is provided by the compiler, even for
+        # freestanding targets, and defines `size_t` and `wchar_t`.
+        file.write('#include <stddef.h>\n')
+        for label, c_type, integral in types:
+            file.write(f'char xcross_size_{label}[sizeof({c_type})];\n')
+            file.write(f'char xcross_align_{label}[_Alignof({c_type})];\n')
+            if integral:
+                file.write(f'char xcross_signed_{label}[(({c_type})-1 < 0) ? 2 : 1];\n')
+
+    with subprocess.Popen(
+        [cc, '-c', 'layout.c', '-o', 'layout.o', '-std=c11'],
+        cwd=workdir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    ) as process:
+        stdout = process.stdout.read().decode('utf-8')
+        if process.wait() != 0:
+            raise ValueError(stdout)
+
+    # Symbols have the user label prefix, such as `_` on SuperH.
+    sizes = elf_symbol_sizes(f'{workdir}/layout.o')
+
+    def symbol_size(name):
+        try:
+            return sizes[f'{prefix}{name}']
+        except KeyError:
+            raise ValueError(f'Unable to find symbol {prefix}{name} in layout.o.')
+
+    layout = {}
+    for label, _, integral in types:
+        layout[label] = {
+            'size': str(symbol_size(f'xcross_size_{label}')),
+            'align': str(symbol_size(f'xcross_align_{label}')),
+        }
+        if integral:
+            layout[label]['signed'] = symbol_size(f'xcross_signed_{label}') == 2
+    return layout
+
+def target_endian(defines):
+    '''Get if the architecture is little-endian'''
+
+    byte_order = defines['__BYTE_ORDER__']
+    if byte_order == '__ORDER_LITTLE_ENDIAN__':
+        return 'little'
+    elif byte_order == '__ORDER_BIG_ENDIAN__':
+        return 'big'
+    elif byte_order == '__ORDER_PDP_ENDIAN__':
+        return 'pdp'
+    raise ValueError('Unknown byte order.')
+
+def char_is_signed(workdir, cc):
+    '''Determine if a character is signed.'''
+
+    devnull = subprocess.DEVNULL
+    with open(f'{workdir}/main.c', 'w') as file:
+        file.write('#include <limits.h>\n')
+        file.write('#if CHAR_MIN < 0\n')
+        file.write('#error signed char\n')
+        file.write('#endif\n')
+        file.write('int main() { return 0; }\n')
+    code = subprocess.call(
+        [cc, 'main.c', '-o', 'main'],
+        cwd=workdir,
+        stdout=devnull,
+        stderr=devnull,
+    )
+    return code != 0
+
+def pic(defines):
+    '''Determine the flag to support position-independent code.'''
+
+    value = defines.get('__PIC__', '0')
+    if value == '1':
+        return '-fpic'
+    if value == '2':
+        return '-fPIC'
+    return None
+
+def pie(defines):
+    '''Determine the flag to support position-independent executables.'''
+
+    value = defines.get('__PIE__', '0')
+    if value == '1':
+        return '-fpie'
+    if value == '2':
+        return '-fPIE'
+    return None
+
+def data_model(data):
+    '''Determine the correct data model, such as ilp32, for the toolchain.'''
+
+    try:
+        c_short = data['target-c-short']['size']
+        c_int = data['target-c-int']['size']
+        c_long = data['target-c-long']['size']
+        c_long_long = data['target-c-long-long']['size']
+        c_pointer = data['target-pointer']['size']
+
+        # (short, int, long, long long, pointer)
+        # short is at least 16 bits
+        # long is at least 32 bits
+        # long long is at least 64 bits
+        models = {
+            ('2', '2', '4', '8', '2'): 'sip2',
+            ('2', '2', '4', '8', '4'): 'lp32',
+            ('2', '4', '4', '8', '4'): 'ilp32',
+            ('2', '4', '4', '8', '8'): 'llp64',
+            ('2', '4', '8', '8', '8'): 'lp64',
+            ('2', '8', '8', '8', '8'): 'ilp64',
+            ('8', '8', '8', '8', '8'): 'silp64',
+        }
+        return models[(c_short, c_int, c_long, c_long_long, c_pointer)]
+    except KeyError:
+        return 'unknown'
+
+def add_exec(path):
+    '''Give a file executable permissions.'''
+
+    flags = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+    st = os.stat(path)
+    os.chmod(path, st.st_mode | flags)
+
+def probe_key(defines, *executables):
+    '''Create a key identifying the toolchain and flags for the probes.'''
+
+    # The compilers may be wrapper scripts, so also hash the
+    # compiler defines, which identify the underlying compiler
+    # version, target, and any CPU-specific flags.
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(defines, sort_keys=True).encode('utf-8'))
+    for envvar in ['ARCH', 'OS', 'FLAGS', 'OPTIONAL_FLAGS', 'CPU']:
+        hasher.update(f'{envvar}={os.environ.get(envvar, "")}\n'.encode('utf-8'))
+    # Any changes to the probes must invalidate the results.
+    executables += (os.path.realpath(__file__),)
+    if os.path.exists(f'{bin_dir}/run'):
+        executables += (f'{bin_dir}/run',)
+    for executable in executables:
+        path = shutil.which(executable) or executable
+        with open(os.path.realpath(path), 'rb') as file:
+            hasher.update(hashlib.sha256(file.read()).digest())
+    return hasher.hexdigest()
+
+class ProbeEngine:
+    '''Run probes concurrently, memoizing the results on disk.'''
+
+    def __init__(self, key, jobs=None):
+        self.key = key
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.executor.shutdown()
+
+    def cache_path(self, name, args):
+        '''Get the path to the memoized result for a probe.'''
+
+        data = json.dumps([self.key, name, args]).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        return f'{cache_dir}/{digest[:2]}/{digest}.json'
+
+    def load(self, path):
+        '''Load a memoized result, returning if the result was found.'''
+
+        try:
+            with open(path) as file:
+                return True, json.load(file)
+        except (OSError, ValueError):
+            return False, None
+
+    def store(self, path, result):
+        '''Memoize a result, ignoring any errors if the cache is unavailable.'''
+
+        # Write to a temporary file first, so concurrent builds
+        # never see a partially written result.
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'w') as file:
+                json.dump(result, file)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def run(self, path, probe, args):
+        '''Run a probe in an isolated directory.'''
+
+        with tempfile.TemporaryDirectory() as workdir:
+            result = probe(workdir, *args)
+        self.store(path, result)
+        return result
+
+    def submit(self, probe, *args):
+        '''Schedule a probe, returning a future for the result.'''
+
+        path = self.cache_path(probe.__name__, args)
+        found, result = self.load(path)
+        if found:
+            future = concurrent.futures.Future()
+            future.set_result(result)
+            return future
+        return self.executor.submit(self.run, path, probe, args)
+
+    def __call__(self, probe, *args):
+        '''Run a probe and wait for the result.'''
+        return self.submit(probe, *args).result()
+
+# The C types to probe, as a map of labels to the type names.
+c_types = {
+    'size_t': 'size_t',
+    'wchar_t': 'wchar_t',
+    'float': 'float',
+    'double': 'double',
+    'long_double': 'long double',
+    'float80': '__float80',
+    'float128': '__float128',
+    'short': 'short',
+    'long': 'long',
+    'long_long': 'long long',
+    'int128': '__int128',
+}
+# The labels of integral types, which have a signedness.
+integral_types = {'char', 'int', 'size_t', 'wchar_t', 'short', 'long', 'long_long', 'int128'}
+
+def layout_types(defines):
+    '''Get the types to probe, as a list of (label, type, is integral).'''
+
+    types = [('char', 'char'), ('int', 'int'), ('pointer', 'char*')]
+    for label, c_type in c_types.items():
+        if f'__SIZEOF_{label.upper()}__' in defines:
+            types.append((label, c_type))
+    return [(label, c_type, label in integral_types) for label, c_type in types]
+
+def fallback_layout(engine, defines, types, cc):
+    '''Calculate the type layouts when the object file cannot be read.'''
+
+    # This is much slower, since it requires a compilation for each
+    # type, but works with any object format. We can only determine
+    # if `char` is signed, and the sizes come from the defines.
+    sizes = {
+        'char': '1',
+        'int': defines['__SIZEOF_INT__'],
+        'pointer': defines['__SIZEOF_POINTER__'],
+    }
+    futures = {label: engine.submit(alignof, c_type, cc) for label, c_type, _ in types}
+    signed = engine.submit(char_is_signed, cc)
+    layout = {}
+    for label, _, _ in types:
+        size = sizes.get(label) or defines[f'__SIZEOF_{label.upper()}__']
+        layout[label] = {'size': size, 'align': futures[label].result()}
+    layout['char']['signed'] = signed.result()
+    return layout
+
+def submit_specifications(engine, defines, linker, cc, cxx):
+    '''Schedule the probes to determine the target specifications.'''
+
+    return {
+        'eh-frame-header': engine.submit(eh_frame_header, linker, cxx),
+        'linker-is-gnu': engine.submit(linker_is_gnu, linker),
+        'layout': engine.submit(
+            abi_layout,
+            layout_types(defines),
+            cc,
+            defines.get('__USER_LABEL_PREFIX__', ''),
+        ),
+    }
+
+def add_specifications(engine, defines, cc, futures):
+    '''Add scripts to display the target specifications.'''
+
+    try:
+        layout = futures['layout'].result()
+    except ValueError:
+        layout = fallback_layout(engine, defines, layout_types(defines), cc)
+
+    data = {
+        'arch': os.environ['ARCH'],
+        'os': os.environ['OS'],
+        'flags': os.environ['FLAGS'],
+        'optional_flags': os.environ['OPTIONAL_FLAGS'],
+        'eh-frame-header': futures['eh-frame-header'].result(),
+        'linker-is-gnu': futures['linker-is-gnu'].result(),
+        'target-endian': target_endian(defines),
+        'target-pointer': layout['pointer'],
+        'target-c-int': layout['int'],
+        'pic': pic(defines),
+        'pie': pie(defines),
+        # Both the size and alignment of `char` are guaranteed
+        # by the standard to be 1 in both C and C++.
+        'target-c-char': layout['char'],
+    }
+    for label in c_types:
+        if label in layout:
+            key = f'target-c-{label.replace("_", "-")}'
+            data[key] = layout[label]
+
+    # Determine the appropriate data model.
+    data['data-model'] = data_model(data)
+
+    # Create a filtered view of our data.
+    data_filtered = {
+        'arch': data['arch'],
+        'os': data['os'],
+        'eh-frame-header': data['eh-frame-header'],
+        'linker-is-gnu': data['linker-is-gnu'],
+        'target-endian': data['target-endian'],
+        'pic': data['pic'],
+        'pie': data['pie'],
+        'char-is-signed': data['target-c-char']['signed'],
+        'data-model': data['data-model'],
+    }
+
+    return data_filtered, data
+
+def missing_stdlib(workdir, cxx):
+    '''Check if by default the library fails to link.'''
+
+    # Check to see if the file compiles by default.
+    # Need to add a dummy _start routine, since some
+    # might say "cannot find entry symbol _start", which
+    # is obviously not what we want.
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('int main() { return 0; }\n')
+        file.write('extern "C" void _start() {}\n')
+    with subprocess.Popen(
+        [cxx, 'main.cc', '-o', 'main', '-Wl,--fatal-warnings'],
+        cwd=workdir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    ) as process:
+        code = process.wait()
+        if code == 0:
+            return []
+        stdout = process.stdout.read().decode('utf-8')
+
+    # If not, we need to parse the link errors to find the missing libraries.
+    regex = re.compile(r'cannot find ([^:]+)(?:: No such file or directory)?')
+    return regex.findall(stdout)
+
+def has_startfiles(workdir, cxx):
+    '''Check if the C-runtime has startfiles.'''
+
+    # Make sure we treat all linker warnings as fatal,
+    # so we don't use an implicit start, like:
+    #   ld: warning: cannot find entry symbol _start; defaulting to 00000000000010dc
+    command = [cxx, 'main.cc', '-o', 'main', '-Wl,--fatal-warnings']
+    devnull = subprocess.DEVNULL
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('int main() { return 0; }\n')
+    code = subprocess.call(command, cwd=workdir, stderr=devnull, stdout=devnull)
+    if code == 0:
+        # Has startfiles, can short-circuit
+        return True
+
+    # Didn't compile , check to see if it works with a dummy
+    # `_start` routine, to provide a fake entrypoint.
+    # We also provide `-nostartfiles`, since some images
+    # have undefined references to other required symbols,
+    # such as `__bss_start__`.
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('int main() { return 0; }\n')
+        file.write('extern "C" void _start() {}\n')
+    code = subprocess.call(
+        command + ['-nostartfiles'],
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    if code != 0:
+        raise ValueError('Unexpected failure, maybe missing more than `_start`?')
+    return False
+
+def has_cxxstdlib(workdir, cxx, startfiles):
+    '''Check if there is a C++ standard library.'''
+
+    devnull = subprocess.DEVNULL
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('#include <algorithm>\n')
+        file.write('#include <cstdint>\n')
+        file.write('int main() { return 0; }\n')
+    command = [cxx, 'main.cc', '-o', 'main']
+    if not startfiles:
+        command.append('-nostartfiles')
+    code = subprocess.call(
+        command,
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    return code == 0
+
+def check_run(workdir, cxx, is_static):
+    '''Check if an image successfully runs.'''
+
+    devnull = subprocess.DEVNULL
+    with open(f'{workdir}/main.cc', 'w') as file:
+        file.write('#include <iostream>\n')
+        file.write('#include <string>\n')
+        file.write('int main() {\n')
+        file.write('std::string hello = std::string("Hello world!");\n')
+        file.write('std::cout << hello << std::endl;\n')
+        file.write('}\n')
+    command = [cxx, 'main.cc', '-o', 'main']
+    if is_static:
+        command.append('-static')
+    else:
+        command.append('-fPIC')
+    subprocess.check_call(
+        command,
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    code = subprocess.call(
+        [f'{bin_dir}/run', 'main'],
+        cwd=workdir,
+        stderr=devnull,
+        stdout=devnull,
+    )
+    return code == 0
+
+def add_warnings(engine, cxx, has_os):
+    '''Add any warnings to a JSON image.'''
+
+    warnings = collections.defaultdict(dict)
+
+    # Check issues at runtime. This is after any symlinks,
+    # so we can check if /opt/bin/run exists. These are
+    # independent of the checks below, so schedule them first.
+    run_futures = None
+    if os.path.exists(f'{bin_dir}/run'):
+        assert has_os
+        run_futures = {
+            'static': engine.submit(check_run, cxx, True),
+            'shared': engine.submit(check_run, cxx, False),
+        }
+
+    # Check if we need `-nostartfiles`, in one
+    # of two conditions: there is no crt0, or
+    # crt0 does not provide a startup routine.
+    #
+    # Note: some libraries don't provide crt0 (like AVR),
+    # but still have startup routines, and some libraries
+    # have different names for crt0. Only search the basepath,
+    # and only if the library fails to compile.
+    #
+    # Option 1:
+    #   ld: cannot find crt0.o: No such file or directory
+    # Option 2:
+    #   ld: lib/crt0.o: in function `_start':
+    #   sparc/crt0.S:38: undefined reference to `__stack
+    if not has_os:
+        missing = engine(missing_stdlib, cxx)
+        crt0 = [i for i in missing if os.path.splitext(i)[0] == 'crt0']
+        startfiles = True
+        if crt0:
+            # Don't warn for redundant crt0 checks.
+            for value in crt0:
+                missing.remove(value)
+            startfiles = False
+            warnings['crt0'] = True
+        if startfiles and not engine(has_startfiles, cxx):
+            startfiles = False
+            warnings['startfiles'] = True
+        if not engine(has_cxxstdlib, cxx, startfiles):
+            warnings['c++-stdlib'] = True
+        if missing:
+            warnings['missing'] = missing
+
+    if run_futures is not None:
+        for linkage, future in run_futures.items():
+            if not future.result():
+                warnings['qemu'][linkage] = True
+
+    return warnings
+
+def main():
+    '''Entry point.'''
+
+    linker = find_linker()
+    cc = find_cc()
+    cxx = find_cxx()
+    has_os = os.environ['OS'] != 'unknown'
+    defines = parse_defines(cc)
+    key = probe_key(defines, linker, cc, cxx)
+    with ProbeEngine(key) as engine:
+        # Schedule the specifications first, since the
+        # warnings have serial dependencies.
+        futures = submit_specifications(engine, defines, linker, cc, cxx)
+        warnings = add_warnings(engine, cxx, has_os)
+        filtered, full = add_specifications(engine, defines, cc, futures)
+
+    # Write out our files.
+    if warnings:
+        with open(f'{bin_dir}/warnings.json', 'w') as file:
+            json.dump(warnings, file)
+    target_specs = f'{bin_dir}/target-specs'
+    target_specs_full = f'{bin_dir}/target-specs-full'
+    with open(f'{target_specs}.json', 'w') as file:
+        json.dump(filtered, file)
+    with open(f'{target_specs_full}.json', 'w') as file:
+        json.dump(full, file)
+    with open(target_specs, 'w') as file:
+        file.write('#/bin/bash\n')
+        file.write(f'cat {target_specs}.json | jq\n')
+    with open(target_specs_full, 'w') as file:
+        file.write('#/bin/bash\n')
+        file.write(f'cat {target_specs_full}.json | jq\n')
+    add_exec(target_specs)
+    add_exec(target_specs_full)
+
+if __name__ == '__main__':
+    main()
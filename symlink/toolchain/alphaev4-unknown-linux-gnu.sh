@@ -0,0 +1,14 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=alphaev4-unknown-linux-gnu
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=alpha
+export LIBPATH="$DIR$PREFIX"/sysroot
+export CC_CPU_LIST="run"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=arceb-unknown-linux-uclibc
+export DIR=/home/cross/x-tools/"$PREFIX"/
+
+shortcut_gcc
+shortcut_util
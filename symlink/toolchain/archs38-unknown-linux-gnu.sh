@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=arc-buildroot-linux-gnu
+export DIR=/home/cross/buildroot/
+
+shortcut_gcc
+shortcut_util
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=arm-unknown-eabi
+export DIR=/home/cross/x-tools/"$PREFIX"/
+
+shortcut_gcc
+shortcut_util
@@ -0,0 +1,13 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=arm-unknown-linux-uclibceabi
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=arm
+export LIBPATH="$DIR$PREFIX"/sysroot
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,13 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=aarch64-unknown-linux-musl
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=aarch64
+export LIBPATH="$DIR$PREFIX"/sysroot
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=aarch64_be-unknown-elf
+export DIR=/home/cross/x-tools/"$PREFIX"/
+
+OPTIONAL_CFLAGS="--specs=nosys.specs" shortcut_gcc
+shortcut_util
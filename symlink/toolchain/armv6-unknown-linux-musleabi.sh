@@ -0,0 +1,13 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=armv6-unknown-linux-musleabi
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=arm
+export LIBPATH="$DIR$PREFIX"/sysroot
+
+OPTIONAL_CFLAGS="-march=armv6" shortcut_gcc
+shortcut_util
+shortcut_run
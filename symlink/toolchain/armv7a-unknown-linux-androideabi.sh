@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=arm-linux-androideabi
+export DIR="/usr/local/ndk/toolchains/llvm/prebuilt/linux-x86_64"
+
+PREFIX=armv7a-linux-androideabi30 shortcut_clang
+shortcut_util
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=csky-buildroot-linux-gnuabiv1
+export DIR=/home/cross/buildroot/
+
+shortcut_gcc
+shortcut_util
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=i386-linux-musl
+export DIR=/home/cross/musl/
+export ARCH=i386
+
+shortcut_gcc
+shortcut_util
+shortcut_run
+
+# These don't work well with the aliased toolchains for shared
+# libraries, so we alias them into /lib.
+for lib in "$DIR$PREFIX"/lib/*.so*; do
+    name=$(basename "$lib")
+    ln -s "$lib" /lib/"$name"
+done
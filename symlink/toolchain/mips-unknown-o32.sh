@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=mips-unknown-elf
+export DIR=/home/cross/x-tools/"$PREFIX"/
+
+CFLAGS="-lc" shortcut_gcc
+shortcut_util
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=mips64-linux-musln32
+export DIR=/home/cross/musl/
+
+shortcut_gcc
+shortcut_util
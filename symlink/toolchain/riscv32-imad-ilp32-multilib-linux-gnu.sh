@@ -0,0 +1,13 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=riscv64-unknown-linux-gnu
+export DIR="/opt/riscv"
+export ARCH=riscv32
+export LIBPATH=("$DIR", "$DIR"/sysroot)
+
+OPTIONAL_CFLAGS="-march=rv32imad -mabi=ilp32" shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=riscv64-unknown-elf
+export DIR="/opt/riscv"
+
+OPTIONAL_CFLAGS="-march=rv64imac -mabi=lp64" shortcut_gcc
+shortcut_util
@@ -0,0 +1,14 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=riscv64-linux-gnu
+export VER=10
+export ARCH=riscv64
+export LIBPATH="/usr/$PREFIX"
+export CC_CPU_LIST="run"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=sh-unknown-elf
+export DIR=/home/cross/x-tools/"$PREFIX"/
+
+CFLAGS="-m2e" shortcut_gcc
+shortcut_util
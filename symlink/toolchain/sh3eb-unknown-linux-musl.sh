@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=sh3eb-linux-musl
+export DIR=/home/cross/musl/
+
+shortcut_gcc
+shortcut_util
@@ -0,0 +1,15 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=sh4-linux-gnu
+export VER=10
+export ARCH=sh4
+export LIBPATH="/usr/$PREFIX"
+export CC_CPU_LIST="run"
+export RUN_CPU_LIST="keep-first"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,15 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=sh4eb-unknown-linux-gnu
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=sh4eb
+export LIBPATH="$DIR$PREFIX"/sysroot
+export CC_CPU_LIST="run"
+export RUN_CPU_LIST="keep-first"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,14 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=sparc-unknown-linux-uclibc
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=sparc
+export LIBPATH="$DIR$PREFIX"/sysroot
+export RUN_CPU_LIST="cc"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,14 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=x86_64-multilib-linux-musl
+export DIR=/home/cross/x-tools/"$PREFIX"/
+export ARCH=x86_64
+export LIBPATH="$DIR$PREFIX"/sysroot
+export LD_LIBRARY_PATH="$LIBPATH/lib64"
+
+shortcut_gcc
+shortcut_util
+shortcut_run
@@ -0,0 +1,10 @@
+#!/bin/bash
+
+scriptdir=`realpath $(dirname "$BASH_SOURCE")`
+source "$scriptdir/shortcut.sh"
+
+export PREFIX=x86_64-linux-muslx32
+export DIR=/home/cross/musl/
+
+shortcut_gcc
+shortcut_util
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+'''
+    bench_xcross
+    ============
+
+    Benchmark the xcross hot paths, using a fake container engine
+    which records each call and simulates the engine latency.
+    Reports the time and the engine processes spawned per call.
+
+    Run with `python test/bench_xcross.py`.
+'''
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+# Import our local xcross.
+test_dir = os.path.dirname(os.path.realpath(__file__))
+xcross_dir = os.path.dirname(test_dir)
+sys.path.insert(0, xcross_dir)
+import xcross
+
+# A fake docker and podman, which record each call.
+fake_engine_dir = f'{test_dir}/fake-engine'
+
+parser = argparse.ArgumentParser(description='Benchmark the xcross hot paths.')
+parser.add_argument(
+    '--iterations',
+    type=int,
+    default=10000,
+    help='Number of calls per measurement for functions without engine calls.',
+)
+parser.add_argument(
+    '--runs',
+    type=int,
+    default=20,
+    help='Number of calls per measurement for functions with engine calls.',
+)
+parser.add_argument(
+    '--latency',
+    type=float,
+    default=0.005,
+    help='Simulated latency of each engine call, in seconds.',
+)
+parser.add_argument(
+    '--engine',
+    default='docker',
+    choices=['docker', 'podman', ''],
+    help='The fake engine to use. If empty, xcross searches for the engine.',
+)
+parser.add_argument(
+    '--output',
+    help='Path to write the JSON results to.',
+)
+
+argv = ['--target', 'alpha-unknown-linux-gnu', 'cmake', '..', '-DCMAKE_BUILD_TYPE=Release']
+
+def count_calls(log):
+    '''Count the engine calls recorded so far.'''
+
+    try:
+        with open(log) as file:
+            return sum(1 for _ in file)
+    except FileNotFoundError:
+        return 0
+
+def run_main():
+    '''Run xcross to completion.'''
+
+    try:
+        xcross.main(argv)
+    except SystemExit as error:
+        if error.code != 0:
+            raise RuntimeError(f'xcross exited with code {error.code}')
+
+def benchmarks():
+    '''Get the functions to benchmark, and if they call the engine.'''
+
+    args = xcross.process_args(argv)
+    xcross.validate_arguments(args)
+    parent_dir = xcross.get_parent_dir(args)
+    current_dir = xcross.get_current_dir()
+    command = ['cmake', '..\\..', '-G', 'Ninja', '.\\build', '-DCMAKE_BUILD_TYPE=Release']
+
+    return [
+        ('process_args', False, lambda: xcross.process_args(argv)),
+        ('validate_arguments', True, lambda: xcross.validate_arguments(xcross.process_args(argv))),
+        ('format_command', False, lambda: xcross.format_command(args)),
+        ('_normpath', False, lambda: xcross._normpath(parent_dir, current_dir, list(command))),
+        ('image_command', False, lambda: xcross.image_command(args, '.')),
+        ('docker_command', False, lambda: xcross.docker_command(args, parent_dir, '.')),
+        ('main', True, run_main),
+    ]
+
+def main(argv=None):
+    '''Run all benchmarks.'''
+
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = f'{tmp}/calls.log'
+        os.environ['PATH'] = f'{fake_engine_dir}{os.pathsep}{os.environ["PATH"]}'
+        os.environ['XCROSS_ENGINE_LOG'] = log
+        os.environ['XCROSS_ENGINE_LATENCY'] = str(args.latency)
+        os.environ['CROSS_ENGINE'] = args.engine
+        os.environ['CROSS_WITH_PACKAGE_MANAGERS'] = ''
+
+        # Times are the fastest of 3 measurements, in microseconds.
+        # The overhead excludes the simulated engine latency.
+        results = {}
+        print(f'{"function":<24}{"time":>12}{"spawns":>10}{"overhead":>12}')
+        for name, calls_engine, function in benchmarks():
+            number = args.runs if calls_engine else args.iterations
+            start = count_calls(log)
+            times = timeit.repeat(function, repeat=3, number=number)
+            spawns = (count_calls(log) - start) / (3 * number)
+            time = 1e6 * min(times) / number
+            overhead = time - 1e6 * spawns * args.latency
+            results[name] = {'time': time, 'spawns': spawns, 'overhead': overhead}
+            print(f'{name:<24}{time:>12.1f}{spawns:>10.1f}{overhead:>12.1f}')
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/bin/bash
+# Benchmark the toolchain and emulator inside an image.
+# Prints the fastest time of all iterations for each workload,
+# in milliseconds, or null if the workload is unsupported.
+
+if [ "$ITERATIONS" = "" ]; then
+    ITERATIONS=3
+fi
+if [ "$RUN_COUNT" = "" ]; then
+    RUN_COUNT=1000000
+fi
+
+measure() {
+    local start
+    local elapsed
+    local best=null
+    for ((i = 0; i < ITERATIONS; i++)); do
+        start=$(date +%s%N)
+        if ! "$@" > /dev/null 2>&1; then
+            echo null
+            return
+        fi
+        elapsed=$(( ($(date +%s%N) - start) / 1000000 ))
+        if [ "$best" = null ] || [ "$elapsed" -lt "$best" ]; then
+            best=$elapsed
+        fi
+    done
+    echo $best
+}
+
+compile_all() {
+    c++ -c "${sources[@]}" $FLAGS
+}
+
+link_all() {
+    for object in *.o; do
+        c++ "$object" -o "${object%.o}" $FLAGS -static || return 1
+    done
+}
+
+builddir=$(mktemp -d)
+cd "$builddir"
+
+# Compile and link the test projects.
+sources=(/test/cpp-helloworld/helloworld.cc /test/cpp-atoi/atoi.cc)
+lines=$(cat "${sources[@]}" | wc -l)
+compile_time=$(measure compile_all)
+link_time=null
+if [ "$compile_time" != null ]; then
+    link_time=$(measure link_all)
+fi
+
+# Run a CPU-bound binary, under Qemu for emulated targets.
+run_time=null
+if command -v run &> /dev/null; then
+    if c++ /test/benchmark/benchmark.cc -o benchmark -O2 $FLAGS -static > /dev/null 2>&1; then
+        run_time=$(measure run benchmark "$RUN_COUNT")
+    fi
+fi
+
+zlib_build() {
+    cmake --build /test/zlib/build --clean-first
+}
+
+# Build the zlib project, which requires the package managers. The
+# first build installs the dependencies, and leaves the vcpkg build
+# configured, so only rebuilding the project is timed.
+zlib_time=null
+if [ "$ZLIB" != "" ] && /test/zlib.sh > /dev/null 2>&1; then
+    zlib_time=$(measure zlib_build)
+fi
+
+cd /
+rm -rf "$builddir"
+
+echo "{\"lines\": $lines, \"compile\": $compile_time, \"link\": $link_time, \"run\": $run_time, \"zlib\": $zlib_time}"
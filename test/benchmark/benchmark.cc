@@ -0,0 +1,27 @@
+// A CPU-bound workload, to measure the emulated execution speed.
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+
+int main(int argc, char** argv) {
+    int64_t count = argc > 1 ? std::atoll(argv[1]) : 1000000;
+
+    // Sieve the primes up to count, and hash them so the
+    // work can't be optimized away.
+    std::vector<bool> composite(count + 1, false);
+    uint32_t hash = 2166136261u;
+    for (int64_t i = 2; i <= count; ++i) {
+        if (composite[i]) {
+            continue;
+        }
+        hash = (hash ^ static_cast<uint32_t>(i)) * 16777619u;
+        for (int64_t j = i * i; j <= count; j += i) {
+            composite[j] = true;
+        }
+    }
+    std::printf("%u\n", hash);
+
+    return 0;
+}
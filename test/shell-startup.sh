@@ -0,0 +1,31 @@
+#!/bin/bash
+# Measure the shell startup time inside an image.
+# Prints the mean time, in microseconds, to start a shell which
+# loads the environment from the profile or from the snapshot.
+
+set -e
+
+if [ "$ITERATIONS" = "" ]; then
+    ITERATIONS=20
+fi
+
+measure() {
+    local start
+    local end
+    start=$(date +%s%N)
+    for ((i = 0; i < ITERATIONS; i++)); do
+        bash -c "$1" > /dev/null 2>&1
+    done
+    end=$(date +%s%N)
+    echo $(( (end - start) / ITERATIONS / 1000 ))
+}
+
+bare=$(measure ':')
+profile=$(measure 'source /etc/profile')
+interactive=$(measure "PS1='$ '; source /etc/profile")
+snapshot=null
+if [ -f /env/snapshot ]; then
+    snapshot=$(measure 'source /env/snapshot')
+fi
+
+echo "{\"bare\": $bare, \"profile\": $profile, \"interactive\": $interactive, \"snapshot\": $snapshot}"
@@ -4,6 +4,7 @@ import errno
 import os
 import pytest
 import sys
+import tempfile
 
 # Import our local xcross.
 test_dir = os.path.dirname(os.path.realpath(__file__))
@@ -14,6 +15,9 @@ import xcross
 os.environ['CROSS_TARGET'] = 'alpha-unknown-linux-gnu'
 os.environ['CROSS_WITH_PACKAGE_MANAGERS'] = ''
 
+# A fake docker and podman, which record each call.
+fake_engine_dir = f'{test_dir}/fake-engine'
+
 def run_validate_arguments(argv):
     args = xcross.process_args(argv)
     try:
@@ -42,15 +46,33 @@ def run_image_command(argv, expected):
     args = xcross.process_args(argv)
     xcross.validate_arguments(args)
     actual = xcross.image_command(args, '.').splitlines()
-    assert actual[0].startswith('source /etc/profile')
-    assert actual[1].startswith('cd /mnt/xcross')
-    assert actual[2] == expected
+    assert f'source {xcross.env_snapshot}' in actual[0]
+    assert 'source /etc/profile' in actual[0]
+    assert f'source {xcross.env_targets}/{args.target}' in actual[1]
+    assert actual[2].startswith('cd /mnt/xcross')
+    assert actual[3] == expected
 
 def run_image(args, exit_code=0):
     with pytest.raises(SystemExit) as exit_error:
         xcross.main(['--target', 'alpha-unknown-linux-gnu'] + args)
     assert exit_error.value.code == exit_code
 
+def run_fake_engine(args, **envvars):
+    environ = os.environ.copy()
+    with tempfile.TemporaryDirectory() as tmp:
+        log = f'{tmp}/calls.log'
+        os.environ.pop('CROSS_ENGINE', None)
+        os.environ['PATH'] = f'{fake_engine_dir}{os.pathsep}{os.environ["PATH"]}'
+        os.environ['XCROSS_ENGINE_LOG'] = log
+        os.environ.update(envvars)
+        try:
+            run_image(args)
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+        with open(log) as file:
+            return [' '.join(i.split()[:2]) for i in file]
+
 def test_get_image():
     run_get_image([
         '--target', 'alpha-unknown-linux-gnu'
@@ -125,6 +147,10 @@ def test_validate_arguments():
 
 def test_run_image_command():
     run_image_command(['make', '-j', '5'], 'make -j 5')
+    run_image_command([
+        '--target', 'riscv32-imac-ilp32-multilib-linux-gnu',
+        'make',
+    ], 'make')
 
 def test_run_image():
     run_image(['echo', 'helloworld'])
@@ -166,3 +192,19 @@ def test_permissions():
         windows_permissions()
     else:
         unix_permissions()
+
+def test_engine_calls():
+    # Every engine call spawns a process, so catch any new calls.
+    hot_path = ['docker image', 'docker run', 'docker rm']
+    calls = run_fake_engine(['echo', 'helloworld'], CROSS_ENGINE='docker')
+    assert calls == ['docker -v'] + hot_path
+    calls = run_fake_engine(['echo', 'helloworld'])
+    assert calls == ['docker -v', 'docker -v'] + hot_path
+    calls = run_fake_engine(
+        ['echo', 'helloworld'],
+        CROSS_ENGINE='docker',
+        XCROSS_ENGINE_NO_IMAGE='1',
+    )
+    assert calls == ['docker -v', 'docker image', 'docker pull', 'docker run', 'docker rm']
+    calls = run_fake_engine(['--engine', 'podman', 'echo', 'helloworld'])
+    assert calls == ['podman -v', 'podman image', 'podman run', 'podman rm']